@@ -503,6 +503,18 @@ class AsyncBolt:
         self.outbox.wrap_message()
         self.responses.append(response)
 
+    def _append_packed(self, data, response=None):
+        """ Appends an already PackStream encoded message to the outgoing
+        queue.
+
+        :param data: the packed message, as produced by
+            :meth:`.Packer.pack_struct`
+        :param response: a response object to handle callbacks
+        """
+        self.outbox.write(data)
+        self.outbox.wrap_message()
+        self.responses.append(response)
+
     async def _send_all(self):
         data = self.outbox.view()
         if data:
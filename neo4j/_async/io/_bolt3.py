@@ -17,7 +17,10 @@
 
 
 from enum import Enum
-from logging import getLogger
+from logging import (
+    DEBUG,
+    getLogger,
+)
 from ssl import SSLSocket
 
 from ..._async_compat.util import AsyncUtil
@@ -90,10 +93,10 @@ class ServerStateManager:
         if metadata.get("has_more"):
             return
         state_before = self.state
-        self.state = self._STATE_TRANSITIONS\
-            .get(self.state, {})\
-            .get(message, self.state)
-        if state_before != self.state and callable(self._on_change):
+        # every state has an entry in the table
+        self.state = self._STATE_TRANSITIONS[state_before].get(message,
+                                                               state_before)
+        if self.state is not state_before and callable(self._on_change):
             self._on_change(state_before, self.state)
 
 
@@ -116,18 +119,20 @@ class AsyncBolt3(AsyncBolt):
         )
 
     def _on_server_state_change(self, old_state, new_state):
-        log.debug("[#%04X]  State: %s > %s", self.local_port,
-                  old_state.name, new_state.name)
+        if log.isEnabledFor(DEBUG):
+            log.debug("[#%04X]  State: %s > %s", self.local_port,
+                      old_state.name, new_state.name)
 
     @property
     def is_reset(self):
         # We can't be sure of the server's state if there are still pending
         # responses. Unless the last message we sent was RESET. In that case
         # the server state will always be READY when we're done.
-        if (self.responses and self.responses[-1]
-                and self.responses[-1].message == "reset"):
-            return True
-        return self._server_state_manager.state == ServerStates.READY
+        if self.responses:
+            last_response = self.responses[-1]
+            if last_response and last_response.message == "reset":
+                return True
+        return self._server_state_manager.state is ServerStates.READY
 
     @property
     def encrypted(self):
@@ -152,10 +157,12 @@ class AsyncBolt3(AsyncBolt):
     async def hello(self):
         headers = self.get_base_headers()
         headers.update(self.auth_dict)
-        logged_headers = dict(headers)
-        if "credentials" in logged_headers:
-            logged_headers["credentials"] = "*******"
-        log.debug("[#%04X]  C: HELLO %r", self.local_port, logged_headers)
+        if log.isEnabledFor(DEBUG):
+            if "credentials" in headers:
+                logged_headers = {**headers, "credentials": "*******"}
+            else:
+                logged_headers = headers
+            log.debug("[#%04X]  C: HELLO %r", self.local_port, logged_headers)
         self._append(b"\x01", (headers,),
                      response=InitResponse(self, "hello",
                                            on_success=self.server_info.update))
@@ -195,8 +202,8 @@ class AsyncBolt3(AsyncBolt):
         self.pull(on_success=metadata.update, on_records=records.extend)
         await self.send_all()
         await self.fetch_all()
-        routing_info = [dict(zip(metadata.get("fields", ()), values)) for values in records]
-        return routing_info
+        fields = metadata.get("fields", ())
+        return [dict(zip(fields, values)) for values in records]
 
     def run(self, query, parameters=None, mode=None, bookmarks=None,
             metadata=None, timeout=None, db=None, imp_user=None, **handlers):
@@ -301,15 +308,16 @@ class AsyncBolt3(AsyncBolt):
         """ Add a RESET message to the outgoing queue, send
         it and consume all remaining messages.
         """
-
-        def fail(metadata):
-            raise BoltProtocolError("RESET failed %r" % metadata, address=self.unresolved_address)
-
         log.debug("[#%04X]  C: RESET", self.local_port)
-        self._append(b"\x0F", response=Response(self, "reset", on_failure=fail))
+        self._append(b"\x0F", response=Response(
+            self, "reset", on_failure=self._on_reset_failure
+        ))
         await self.send_all()
         await self.fetch_all()
 
+    def _on_reset_failure(self, metadata):
+        raise BoltProtocolError("RESET failed %r" % metadata, address=self.unresolved_address)
+
     def goodbye(self):
         log.debug("[#%04X]  C: GOODBYE", self.local_port)
         self._append(b"\x02", ())
@@ -16,7 +16,10 @@
 # limitations under the License.
 
 
-from logging import getLogger
+from logging import (
+    DEBUG,
+    getLogger,
+)
 from ssl import SSLSocket
 
 from ..._async_compat.util import AsyncUtil
@@ -40,9 +43,13 @@ from ._bolt3 import (
 )
 from ._bolt import AsyncBolt
 from ._common import (
+    build_tx_extra,
     check_supported_server_product,
+    coerce_bookmarks,
     CommitResponse,
+    EMPTY_EXTRA,
     InitResponse,
+    READ_EXTRA,
     Response,
 )
 
@@ -50,6 +57,11 @@ from ._common import (
 log = getLogger("neo4j")
 
 
+# Fields of PULL/DISCARD for all records of the most recent query. Shared
+# between all calls, so never mutate.
+_ALL_OF_LAST_QUERY_FIELDS = ({"n": -1},)
+
+
 class AsyncBolt4x0(AsyncBolt):
     """ Protocol handler for Bolt 4.0.
 
@@ -62,29 +74,40 @@ class AsyncBolt4x0(AsyncBolt):
 
     supports_multiple_databases = True
 
+    _supports_impersonation = False
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._server_state_manager = ServerStateManager(
             ServerStates.CONNECTED, on_change=self._on_server_state_change
         )
+        # The socket is fixed for the lifetime of the connection. Resolving
+        # these once saves a syscall for every (debug) log line.
+        self._encrypted = isinstance(self.socket, SSLSocket)
+        try:
+            self._local_port = self.socket.getsockname()[1]
+        except OSError:
+            self._local_port = 0
 
     def _on_server_state_change(self, old_state, new_state):
-        log.debug("[#%04X]  State: %s > %s", self.local_port,
-                  old_state.name, new_state.name)
+        if log.isEnabledFor(DEBUG):
+            log.debug("[#%04X]  State: %s > %s", self.local_port,
+                      old_state.name, new_state.name)
 
     @property
     def is_reset(self):
         # We can't be sure of the server's state if there are still pending
         # responses. Unless the last message we sent was RESET. In that case
         # the server state will always be READY when we're done.
-        if (self.responses and self.responses[-1]
-                and self.responses[-1].message == "reset"):
-            return True
-        return self._server_state_manager.state == ServerStates.READY
+        if self.responses:
+            last_response = self.responses[-1]
+            if last_response and last_response.message == "reset":
+                return True
+        return self._server_state_manager.state is ServerStates.READY
 
     @property
     def encrypted(self):
-        return isinstance(self.socket, SSLSocket)
+        return self._encrypted
 
     @property
     def der_encoded_server_certificate(self):
@@ -92,10 +115,7 @@ class AsyncBolt4x0(AsyncBolt):
 
     @property
     def local_port(self):
-        try:
-            return self.socket.getsockname()[1]
-        except OSError:
-            return 0
+        return self._local_port
 
     def get_base_headers(self):
         return {
@@ -103,12 +123,13 @@ class AsyncBolt4x0(AsyncBolt):
         }
 
     async def hello(self):
-        headers = self.get_base_headers()
-        headers.update(self.auth_dict)
-        logged_headers = dict(headers)
-        if "credentials" in logged_headers:
-            logged_headers["credentials"] = "*******"
-        log.debug("[#%04X]  C: HELLO %r", self.local_port, logged_headers)
+        headers = {**self.get_base_headers(), **self.auth_dict}
+        if log.isEnabledFor(DEBUG):
+            if "credentials" in headers:
+                logged_headers = {**headers, "credentials": "*******"}
+            else:
+                logged_headers = headers
+            log.debug("[#%04X]  C: HELLO %r", self.local_port, logged_headers)
         self._append(b"\x01", (headers,),
                      response=InitResponse(self, "hello",
                      on_success=self.server_info.update))
@@ -148,12 +169,12 @@ class AsyncBolt4x0(AsyncBolt):
         self.pull(on_success=metadata.update, on_records=records.extend)
         await self.send_all()
         await self.fetch_all()
-        routing_info = [dict(zip(metadata.get("fields", ()), values)) for values in records]
-        return routing_info
+        fields = metadata.get("fields", ())
+        return [dict(zip(fields, values)) for values in records]
 
     def run(self, query, parameters=None, mode=None, bookmarks=None,
             metadata=None, timeout=None, db=None, imp_user=None, **handlers):
-        if imp_user is not None:
+        if imp_user is not None and not self._supports_impersonation:
             raise ConfigurationError(
                 "Impersonation is not supported in Bolt Protocol {!r}. "
                 "Trying to impersonate {!r}.".format(
@@ -162,77 +183,51 @@ class AsyncBolt4x0(AsyncBolt):
             )
         if not parameters:
             parameters = {}
-        extra = {}
-        if mode in (READ_ACCESS, "r"):
-            extra["mode"] = "r"  # It will default to mode "w" if nothing is specified
-        if db:
-            extra["db"] = db
-        if bookmarks:
-            try:
-                extra["bookmarks"] = list(bookmarks)
-            except TypeError:
-                raise TypeError("Bookmarks must be provided within an iterable")
-        if metadata:
-            try:
-                extra["tx_metadata"] = dict(metadata)
-            except TypeError:
-                raise TypeError("Metadata must be coercible to a dict")
-        if timeout is not None:
-            try:
-                extra["tx_timeout"] = int(1000 * float(timeout))
-            except TypeError:
-                raise TypeError("Timeout must be specified as a number of seconds")
-            if extra["tx_timeout"] < 0:
-                raise ValueError("Timeout must be a positive number or 0.")
+        if not (db or imp_user or bookmarks or metadata) and timeout is None:
+            extra = READ_EXTRA if mode in (READ_ACCESS, "r") else EMPTY_EXTRA
+        else:
+            extra = build_tx_extra(mode, db, imp_user, bookmarks, metadata,
+                                   timeout)
         fields = (query, parameters, extra)
-        log.debug("[#%04X]  C: RUN %s", self.local_port, " ".join(map(repr, fields)))
+        log.debug("[#%04X]  C: RUN %r %r %r", self.local_port, *fields)
         self._append(b"\x10", fields, Response(self, "run", **handlers))
 
     def discard(self, n=-1, qid=-1, **handlers):
-        extra = {"n": n}
-        if qid != -1:
-            extra["qid"] = qid
-        log.debug("[#%04X]  C: DISCARD %r", self.local_port, extra)
-        self._append(b"\x2F", (extra,), Response(self, "discard", **handlers))
+        if n == -1 and qid == -1:
+            fields = _ALL_OF_LAST_QUERY_FIELDS
+        else:
+            extra = {"n": n}
+            if qid != -1:
+                extra["qid"] = qid
+            fields = (extra,)
+        log.debug("[#%04X]  C: DISCARD %r", self.local_port, fields[0])
+        self._append(b"\x2F", fields, Response(self, "discard", **handlers))
 
     def pull(self, n=-1, qid=-1, **handlers):
-        extra = {"n": n}
-        if qid != -1:
-            extra["qid"] = qid
-        log.debug("[#%04X]  C: PULL %r", self.local_port, extra)
-        self._append(b"\x3F", (extra,), Response(self, "pull", **handlers))
+        if n == -1 and qid == -1:
+            fields = _ALL_OF_LAST_QUERY_FIELDS
+        else:
+            extra = {"n": n}
+            if qid != -1:
+                extra["qid"] = qid
+            fields = (extra,)
+        log.debug("[#%04X]  C: PULL %r", self.local_port, fields[0])
+        self._append(b"\x3F", fields, Response(self, "pull", **handlers))
 
     def begin(self, mode=None, bookmarks=None, metadata=None, timeout=None,
               db=None, imp_user=None, **handlers):
-        if imp_user is not None:
+        if imp_user is not None and not self._supports_impersonation:
             raise ConfigurationError(
                 "Impersonation is not supported in Bolt Protocol {!r}. "
                 "Trying to impersonate {!r}.".format(
                     self.PROTOCOL_VERSION, imp_user
                 )
             )
-        extra = {}
-        if mode in (READ_ACCESS, "r"):
-            extra["mode"] = "r"  # It will default to mode "w" if nothing is specified
-        if db:
-            extra["db"] = db
-        if bookmarks:
-            try:
-                extra["bookmarks"] = list(bookmarks)
-            except TypeError:
-                raise TypeError("Bookmarks must be provided within an iterable")
-        if metadata:
-            try:
-                extra["tx_metadata"] = dict(metadata)
-            except TypeError:
-                raise TypeError("Metadata must be coercible to a dict")
-        if timeout is not None:
-            try:
-                extra["tx_timeout"] = int(1000 * float(timeout))
-            except TypeError:
-                raise TypeError("Timeout must be specified as a number of seconds")
-            if extra["tx_timeout"] < 0:
-                raise ValueError("Timeout must be a positive number or 0.")
+        if not (db or imp_user or bookmarks or metadata) and timeout is None:
+            extra = READ_EXTRA if mode in (READ_ACCESS, "r") else EMPTY_EXTRA
+        else:
+            extra = build_tx_extra(mode, db, imp_user, bookmarks, metadata,
+                                   timeout)
         log.debug("[#%04X]  C: BEGIN %r", self.local_port, extra)
         self._append(b"\x11", (extra,), Response(self, "begin", **handlers))
 
@@ -248,15 +243,16 @@ class AsyncBolt4x0(AsyncBolt):
         """ Add a RESET message to the outgoing queue, send
         it and consume all remaining messages.
         """
-
-        def fail(metadata):
-            raise BoltProtocolError("RESET failed %r" % metadata, self.unresolved_address)
-
         log.debug("[#%04X]  C: RESET", self.local_port)
-        self._append(b"\x0F", response=Response(self, "reset", on_failure=fail))
+        self._append(b"\x0F", response=Response(
+            self, "reset", on_failure=self._on_reset_failure
+        ))
         await self.send_all()
         await self.fetch_all()
 
+    def _on_reset_failure(self, metadata):
+        raise BoltProtocolError("RESET failed %r" % metadata, self.unresolved_address)
+
     def goodbye(self):
         log.debug("[#%04X]  C: GOODBYE", self.local_port)
         self._append(b"\x02", ())
@@ -277,37 +273,51 @@ class AsyncBolt4x0(AsyncBolt):
 
         response = self.responses.popleft()
         response.complete = True
-        if summary_signature == b"\x70":
-            log.debug("[#%04X]  S: SUCCESS %r", self.local_port, summary_metadata)
-            self._server_state_manager.transition(response.message,
-                                                  summary_metadata)
-            await response.on_success(summary_metadata or {})
-        elif summary_signature == b"\x7E":
-            log.debug("[#%04X]  S: IGNORED", self.local_port)
-            await response.on_ignored(summary_metadata or {})
-        elif summary_signature == b"\x7F":
-            log.debug("[#%04X]  S: FAILURE %r", self.local_port, summary_metadata)
-            self._server_state_manager.state = ServerStates.FAILED
-            try:
-                await response.on_failure(summary_metadata or {})
-            except (ServiceUnavailable, DatabaseUnavailable):
-                if self.pool:
-                    await self.pool.deactivate(address=self.unresolved_address)
-                raise
-            except (NotALeader, ForbiddenOnReadOnlyDatabase):
-                if self.pool:
-                    self.pool.on_write_failure(address=self.unresolved_address)
-                raise
-            except Neo4jError as e:
-                if self.pool and e.invalidates_all_connections():
-                    await self.pool.mark_all_stale()
-                raise
-        else:
+        handler = self._SUMMARY_HANDLERS.get(summary_signature)
+        if handler is None:
             raise BoltProtocolError("Unexpected response message with signature "
                                     "%02X" % ord(summary_signature), self.unresolved_address)
+        await handler(self, response, summary_metadata)
 
         return len(details), 1
 
+    async def _handle_success(self, response, summary_metadata):
+        log.debug("[#%04X]  S: SUCCESS %r", self.local_port, summary_metadata)
+        self._server_state_manager.transition(response.message,
+                                              summary_metadata)
+        await response.on_success(summary_metadata or {})
+
+    async def _handle_ignored(self, response, summary_metadata):
+        log.debug("[#%04X]  S: IGNORED", self.local_port)
+        await response.on_ignored(summary_metadata or {})
+
+    async def _handle_failure(self, response, summary_metadata):
+        log.debug("[#%04X]  S: FAILURE %r", self.local_port, summary_metadata)
+        self._server_state_manager.state = ServerStates.FAILED
+        try:
+            await response.on_failure(summary_metadata or {})
+        except (ServiceUnavailable, DatabaseUnavailable):
+            if self.pool:
+                await self.pool.deactivate(address=self.unresolved_address)
+            raise
+        except (NotALeader, ForbiddenOnReadOnlyDatabase):
+            if self.pool:
+                self.pool.on_write_failure(address=self.unresolved_address)
+            raise
+        except Neo4jError as e:
+            if self.pool and e.invalidates_all_connections():
+                await self.pool.mark_all_stale()
+            raise
+
+    # Summary message signature -> handler. The handlers are stored as plain
+    # functions; subclasses that need different handling must provide their
+    # own table.
+    _SUMMARY_HANDLERS = {
+        b"\x70": _handle_success,
+        b"\x7E": _handle_ignored,
+        b"\x7F": _handle_failure,
+    }
+
 
 class AsyncBolt4x1(AsyncBolt4x0):
     """ Protocol handler for Bolt 4.1.
@@ -317,18 +327,26 @@ class AsyncBolt4x1(AsyncBolt4x0):
 
     PROTOCOL_VERSION = Version(4, 1)
 
+    _base_headers = None
+
     def get_base_headers(self):
         """ Bolt 4.1 passes the routing context, originally taken from
         the URI, into the connection initialisation message. This
         enables server-side routing to propagate the same behaviour
         through its driver.
+
+        The user agent and routing context don't change over the lifetime
+        of the connection, so the headers are built once. The returned dict
+        is shared and must not be mutated.
         """
-        headers = {
-            "user_agent": self.user_agent,
-        }
-        if self.routing_context is not None:
-            headers["routing"] = self.routing_context
-        return headers
+        if self._base_headers is None:
+            headers = {
+                "user_agent": self.user_agent,
+            }
+            if self.routing_context is not None:
+                headers["routing"] = self.routing_context
+            self._base_headers = headers
+        return self._base_headers
 
 
 class AsyncBolt4x2(AsyncBolt4x1):
@@ -364,7 +382,7 @@ class AsyncBolt4x3(AsyncBolt4x2):
         if bookmarks is None:
             bookmarks = []
         else:
-            bookmarks = list(bookmarks)
+            bookmarks = coerce_bookmarks(bookmarks)
         self._append(b"\x66", (routing_context, bookmarks, database),
                      response=Response(self, "route",
                                        on_success=metadata.update))
@@ -388,12 +406,13 @@ class AsyncBolt4x3(AsyncBolt4x2):
                              "the server and network is set up correctly.",
                              self.local_port, recv_timeout)
 
-        headers = self.get_base_headers()
-        headers.update(self.auth_dict)
-        logged_headers = dict(headers)
-        if "credentials" in logged_headers:
-            logged_headers["credentials"] = "*******"
-        log.debug("[#%04X]  C: HELLO %r", self.local_port, logged_headers)
+        headers = {**self.get_base_headers(), **self.auth_dict}
+        if log.isEnabledFor(DEBUG):
+            if "credentials" in headers:
+                logged_headers = {**headers, "credentials": "*******"}
+            else:
+                logged_headers = headers
+            log.debug("[#%04X]  C: HELLO %r", self.local_port, logged_headers)
         self._append(b"\x01", (headers,),
                      response=InitResponse(self, "hello",
                                            on_success=on_success))
@@ -410,6 +429,8 @@ class AsyncBolt4x4(AsyncBolt4x3):
 
     PROTOCOL_VERSION = Version(4, 4)
 
+    _supports_impersonation = True
+
     async def route(self, database=None, imp_user=None, bookmarks=None):
         routing_context = self.routing_context or {}
         db_context = {}
@@ -423,74 +444,10 @@ class AsyncBolt4x4(AsyncBolt4x3):
         if bookmarks is None:
             bookmarks = []
         else:
-            bookmarks = list(bookmarks)
+            bookmarks = coerce_bookmarks(bookmarks)
         self._append(b"\x66", (routing_context, bookmarks, db_context),
                      response=Response(self, "route",
                                        on_success=metadata.update))
         await self.send_all()
         await self.fetch_all()
         return [metadata.get("rt")]
-
-    def run(self, query, parameters=None, mode=None, bookmarks=None,
-            metadata=None, timeout=None, db=None, imp_user=None, **handlers):
-        if not parameters:
-            parameters = {}
-        extra = {}
-        if mode in (READ_ACCESS, "r"):
-            # It will default to mode "w" if nothing is specified
-            extra["mode"] = "r"
-        if db:
-            extra["db"] = db
-        if imp_user:
-            extra["imp_user"] = imp_user
-        if bookmarks:
-            try:
-                extra["bookmarks"] = list(bookmarks)
-            except TypeError:
-                raise TypeError("Bookmarks must be provided within an iterable")
-        if metadata:
-            try:
-                extra["tx_metadata"] = dict(metadata)
-            except TypeError:
-                raise TypeError("Metadata must be coercible to a dict")
-        if timeout is not None:
-            try:
-                extra["tx_timeout"] = int(1000 * float(timeout))
-            except TypeError:
-                raise TypeError("Timeout must be specified as a number of seconds")
-            if extra["tx_timeout"] < 0:
-                raise ValueError("Timeout must be a positive number or 0.")
-        fields = (query, parameters, extra)
-        log.debug("[#%04X]  C: RUN %s", self.local_port,
-                  " ".join(map(repr, fields)))
-        self._append(b"\x10", fields, Response(self, "run", **handlers))
-
-    def begin(self, mode=None, bookmarks=None, metadata=None, timeout=None,
-              db=None, imp_user=None, **handlers):
-        extra = {}
-        if mode in (READ_ACCESS, "r"):
-            # It will default to mode "w" if nothing is specified
-            extra["mode"] = "r"
-        if db:
-            extra["db"] = db
-        if imp_user:
-            extra["imp_user"] = imp_user
-        if bookmarks:
-            try:
-                extra["bookmarks"] = list(bookmarks)
-            except TypeError:
-                raise TypeError("Bookmarks must be provided within an iterable")
-        if metadata:
-            try:
-                extra["tx_metadata"] = dict(metadata)
-            except TypeError:
-                raise TypeError("Metadata must be coercible to a dict")
-        if timeout is not None:
-            try:
-                extra["tx_timeout"] = int(1000 * float(timeout))
-            except TypeError:
-                raise TypeError("Timeout must be specified as a number of seconds")
-            if extra["tx_timeout"] < 0:
-                raise ValueError("Timeout must be a positive number or 0.")
-        log.debug("[#%04X]  C: BEGIN %r", self.local_port, extra)
-        self._append(b"\x11", (extra,), Response(self, "begin", **handlers))
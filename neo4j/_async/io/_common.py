@@ -20,9 +20,9 @@ import asyncio
 from contextlib import contextmanager
 import logging
 import socket
-from struct import pack as struct_pack
 
 from ..._async_compat.util import AsyncUtil
+from ...api import READ_ACCESS
 from ...exceptions import (
     Neo4jError,
     ServiceUnavailable,
@@ -30,6 +30,7 @@ from ...exceptions import (
     UnsupportedServerProduct,
 )
 from ...packstream import (
+    PACKED_UINT_16,
     UnpackableBuffer,
     Unpacker,
 )
@@ -40,44 +41,115 @@ log = logging.getLogger("neo4j")
 
 class AsyncMessageInbox:
 
+    __slots__ = (
+        "on_error", "_socket", "_buffer", "_unpacker", "_rx_view",
+        "_rx_start", "_rx_end", "_local_port", "_broken",
+    )
+
+    read_ahead_size = 8192
+
     def __init__(self, s, on_error):
         self.on_error = on_error
-        self._messages = self._yield_messages(s)
+        self._socket = s
+        self._buffer = UnpackableBuffer()
+        self._unpacker = Unpacker(self._buffer)
+        # bytes read from the socket ahead of the current message
+        self._rx_view = memoryview(bytearray(self.read_ahead_size))
+        self._rx_start = 0
+        self._rx_end = 0
+        # resolved on the first logged NOOP, the port doesn't change
+        self._local_port = None
+        self._broken = False
 
-    async def _yield_messages(self, sock):
+    async def pop(self):
+        if self._broken:
+            raise StopAsyncIteration
+        sock = self._socket
+        buffer = self._buffer
         try:
-            buffer = UnpackableBuffer()
-            unpacker = Unpacker(buffer)
             chunk_size = 0
             while True:
 
                 while chunk_size == 0:
                     # Determine the chunk size and skip noop
-                    await receive_into_buffer(sock, buffer, 2)
+                    await self._receive(2)
                     chunk_size = buffer.pop_u16()
-                    if chunk_size == 0:
-                        log.debug("[#%04X]  S: <NOOP>", sock.getsockname()[1])
+                    if chunk_size == 0 and log.isEnabledFor(logging.DEBUG):
+                        if self._local_port is None:
+                            self._local_port = sock.getsockname()[1]
+                        log.debug("[#%04X]  S: <NOOP>", self._local_port)
 
-                await receive_into_buffer(sock, buffer, chunk_size + 2)
+                await self._receive(chunk_size + 2)
                 chunk_size = buffer.pop_u16()
 
                 if chunk_size == 0:
                     # chunk_size was the end marker for the message
+                    unpacker = self._unpacker
                     size, tag = unpacker.unpack_structure_header()
-                    fields = [unpacker.unpack() for _ in range(size)]
-                    yield tag, fields
+                    fields = unpacker.unpack_n(size)
                     # Reset for new message
                     unpacker.reset()
+                    return tag, fields
 
         except (OSError, socket.timeout) as error:
+            self._abandon()
             await AsyncUtil.callback(self.on_error, error)
+        except BaseException:
+            # e.g. cancelled mid-message: the partially read message can't be
+            # resumed, so don't hand out anything read after it either
+            self._abandon()
+            raise
+        raise StopAsyncIteration
 
-    async def pop(self):
-        return await AsyncUtil.next(self._messages)
+    def _abandon(self):
+        # Give up on the stream. Drop the partial message and the bytes read
+        # ahead, which belong to a position in the stream that is lost.
+        self._broken = True
+        self._rx_start = self._rx_end = 0
+        self._buffer.reset()
+
+    async def _receive(self, n_bytes):
+        """ Append the next n_bytes of the stream to the message buffer.
+
+        The socket is read in blocks of up to read_ahead_size bytes, so a
+        chunk header and the chunk following it usually take a single read.
+        """
+        buffer = self._buffer
+        end = buffer.used + n_bytes
+        if end > len(buffer.data):
+            buffer.data += bytearray(end - len(buffer.data))
+        view = memoryview(buffer.data)
+        rx_view = self._rx_view
+        while buffer.used < end:
+            missing = end - buffer.used
+            available = self._rx_end - self._rx_start
+            if available:
+                n = min(available, missing)
+                start = self._rx_start
+                used = buffer.used
+                view[used:(used + n)] = rx_view[start:(start + n)]
+                self._rx_start = start + n
+            elif missing >= len(rx_view):
+                # large reads go straight into the message buffer
+                n = await self._socket.recv_into(
+                    view[buffer.used:end], missing
+                )
+                if n == 0:
+                    raise OSError("No data")
+            else:
+                n = await self._socket.recv_into(rx_view, len(rx_view))
+                if n == 0:
+                    raise OSError("No data")
+                self._rx_start = 0
+                self._rx_end = n
+                continue
+            buffer.used += n
 
 
 class AsyncInbox(AsyncMessageInbox):
 
+    __slots__ = ()
+
     async def __anext__(self):
         tag, fields = await self.pop()
         if tag == b"\x71":
@@ -90,6 +162,11 @@ class AsyncInbox(AsyncMessageInbox):
 
 class Outbox:
 
+    __slots__ = (
+        "_max_chunk_size", "_chunked_data", "_raw_data", "write",
+        "_tmp_buffering",
+    )
+
     def __init__(self, max_chunk_size=16384):
         self._max_chunk_size = max_chunk_size
         self._chunked_data = bytearray()
@@ -107,29 +184,26 @@ class Outbox:
         self._raw_data.clear()
 
     def _chunk_data(self):
-        data_len = len(self._raw_data)
-        num_full_chunks, chunk_rest = divmod(
-            data_len, self._max_chunk_size
-        )
-        num_chunks = num_full_chunks + bool(chunk_rest)
-
-        data_view = memoryview(self._raw_data)
-        header_start = len(self._chunked_data)
-        data_start = header_start + 2
-        raw_data_start = 0
-        for i in range(num_chunks):
-            chunk_size = min(data_len - raw_data_start,
-                             self._max_chunk_size)
-            self._chunked_data[header_start:data_start] = struct_pack(
-                ">H", chunk_size
-            )
-            self._chunked_data[data_start:(data_start + chunk_size)] = \
-                data_view[raw_data_start:(raw_data_start + chunk_size)]
-            header_start += chunk_size + 2
-            data_start = header_start + 2
-            raw_data_start += chunk_size
-        del data_view
-        self._raw_data.clear()
+        raw_data = self._raw_data
+        data_len = len(raw_data)
+        if not data_len:
+            return
+        chunked_data = self._chunked_data
+        max_chunk_size = self._max_chunk_size
+        if data_len <= max_chunk_size:
+            # fast path: the whole message fits into a single chunk
+            chunked_data += PACKED_UINT_16[data_len]
+            chunked_data += raw_data
+        else:
+            data_view = memoryview(raw_data)
+            for start in range(0, data_len, max_chunk_size):
+                chunk = data_view[start:(start + max_chunk_size)]
+                chunked_data += PACKED_UINT_16[len(chunk)]
+                chunked_data += chunk
+                del chunk
+            # release the view, else raw_data can't be resized
+            del data_view
+        raw_data.clear()
 
     def wrap_message(self):
         if self._tmp_buffering:
@@ -156,6 +230,10 @@ class Outbox:
             self._tmp_buffering -= 1
 
 
+# Errors ConnectionErrorHandler reports to its on_error callback
+_CONNECTION_ERRORS = (Neo4jError, ServiceUnavailable, SessionExpired)
+
+
 class ConnectionErrorHandler:
     """
     Wrapper class for handling connection errors.
@@ -184,8 +262,8 @@ class ConnectionErrorHandler:
         def outer(func):
             def inner(*args, **kwargs):
                 try:
-                    func(*args, **kwargs)
-                except (Neo4jError, ServiceUnavailable, SessionExpired) as exc:
+                    return func(*args, **kwargs)
+                except _CONNECTION_ERRORS as exc:
                     assert not asyncio.iscoroutinefunction(self.__on_error)
                     self.__on_error(exc)
                     raise
@@ -194,21 +272,29 @@ class ConnectionErrorHandler:
         def outer_async(coroutine_func):
             async def inner(*args, **kwargs):
                 try:
-                    await coroutine_func(*args, **kwargs)
-                except (Neo4jError, ServiceUnavailable, SessionExpired) as exc:
+                    return await coroutine_func(*args, **kwargs)
+                except _CONNECTION_ERRORS as exc:
                     await AsyncUtil.callback(self.__on_error, exc)
                     raise
             return inner
 
         if asyncio.iscoroutinefunction(connection_attr):
-            return outer_async(connection_attr)
-        return outer(connection_attr)
+            wrapper = outer_async(connection_attr)
+        else:
+            wrapper = outer(connection_attr)
+        # Methods don't change over the connection's lifetime. Keeping the
+        # wrapper on the instance means later lookups of the same name don't
+        # get here anymore.
+        super().__setattr__(name, wrapper)
+        return wrapper
 
     def __setattr__(self, name, value):
         if name.startswith("_" + self.__class__.__name__ + "__"):
             super().__setattr__(name, value)
         else:
             setattr(self.__connection, name, value)
+            # a wrapper around the replaced attribute would shadow the new one
+            self.__dict__.pop(name, None)
 
 
 class Response:
@@ -216,27 +302,37 @@ class Response:
     more detail messages followed by one summary message).
     """
 
+    __slots__ = (
+        "connection", "handlers", "message", "complete", "_on_records",
+        "_on_success", "_on_summary", "_on_failure", "_on_ignored",
+    )
+
     def __init__(self, connection, message, **handlers):
         self.connection = connection
         self.handlers = handlers
         self.message = message
         self.complete = False
+        # resolved once: the callbacks below run for every message received
+        self._on_records = handlers.get("on_records")
+        self._on_success = handlers.get("on_success")
+        self._on_summary = handlers.get("on_summary")
+        self._on_failure = handlers.get("on_failure")
+        self._on_ignored = handlers.get("on_ignored")
 
     async def on_records(self, records):
         """ Called when one or more RECORD messages have been received.
         """
-        handler = self.handlers.get("on_records")
-        await AsyncUtil.callback(handler, records)
+        handler = self._on_records
+        if handler is not None:
+            await AsyncUtil.callback(handler, records)
 
     async def on_success(self, metadata):
         """ Called when a SUCCESS message has been received.
         """
-        handler = self.handlers.get("on_success")
-        await AsyncUtil.callback(handler, metadata)
+        await AsyncUtil.callback(self._on_success, metadata)
 
         if not metadata.get("has_more"):
-            handler = self.handlers.get("on_summary")
-            await AsyncUtil.callback(handler)
+            await AsyncUtil.callback(self._on_summary)
 
     async def on_failure(self, metadata):
         """ Called when a FAILURE message has been received.
@@ -245,23 +341,21 @@ class Response:
             await self.connection.reset()
         except (SessionExpired, ServiceUnavailable):
             pass
-        handler = self.handlers.get("on_failure")
-        await AsyncUtil.callback(handler, metadata)
-        handler = self.handlers.get("on_summary")
-        await AsyncUtil.callback(handler)
+        await AsyncUtil.callback(self._on_failure, metadata)
+        await AsyncUtil.callback(self._on_summary)
         raise Neo4jError.hydrate(**metadata)
 
     async def on_ignored(self, metadata=None):
         """ Called when an IGNORED message has been received.
         """
-        handler = self.handlers.get("on_ignored")
-        await AsyncUtil.callback(handler, metadata)
-        handler = self.handlers.get("on_summary")
-        await AsyncUtil.callback(handler)
+        await AsyncUtil.callback(self._on_ignored, metadata)
+        await AsyncUtil.callback(self._on_summary)
 
 
 class InitResponse(Response):
 
+    __slots__ = ()
+
     async def on_failure(self, metadata):
         code = metadata.get("code")
         if code == "Neo.ClientError.Security.Unauthorized":
@@ -274,7 +368,7 @@ class InitResponse(Response):
 
 class CommitResponse(Response):
 
-    pass
+    __slots__ = ()
 
 
 def check_supported_server_product(agent):
@@ -288,13 +382,80 @@ def check_supported_server_product(agent):
         raise UnsupportedServerProduct(agent)
 
 
-async def receive_into_buffer(sock, buffer, n_bytes):
-    end = buffer.used + n_bytes
-    if end > len(buffer.data):
-        buffer.data += bytearray(end - len(buffer.data))
-    view = memoryview(buffer.data)
-    while buffer.used < end:
-        n = await sock.recv_into(view[buffer.used:end], end - buffer.used)
-        if n == 0:
-            raise OSError("No data")
-        buffer.used += n
+def coerce_bookmarks(bookmarks):
+    """ Turn bookmarks into a list that can be sent as transaction extra.
+
+    Messages are packed right away, so a list is passed on without copying.
+
+    :raises TypeError: if bookmarks is not iterable
+    """
+    if isinstance(bookmarks, list):
+        return bookmarks
+    try:
+        return list(bookmarks)
+    except TypeError:
+        raise TypeError("Bookmarks must be provided within an iterable")
+
+
+def coerce_metadata(metadata):
+    """ Turn transaction metadata into a dict that can be sent as transaction
+    extra.
+
+    Messages are packed right away, so a dict is passed on without copying.
+
+    :raises TypeError: if metadata cannot be turned into a dict
+    """
+    if isinstance(metadata, dict):
+        return metadata
+    try:
+        return dict(metadata)
+    except TypeError:
+        raise TypeError("Metadata must be coercible to a dict")
+
+
+def coerce_tx_timeout(timeout):
+    """ Turn a transaction timeout in seconds into milliseconds.
+
+    :raises TypeError: if timeout is not a number
+    :raises ValueError: if timeout is negative
+    """
+    if type(timeout) is int:
+        tx_timeout = 1000 * timeout
+    elif isinstance(timeout, float):
+        tx_timeout = int(1000 * timeout)
+    else:
+        try:
+            tx_timeout = int(1000 * float(timeout))
+        except TypeError:
+            raise TypeError("Timeout must be specified as a number of seconds")
+    if tx_timeout < 0:
+        raise ValueError("Timeout must be a positive number or 0.")
+    return tx_timeout
+
+
+# RUN and BEGIN without any transaction configuration are by far the most
+# common messages. Their ``extra`` is shared between all calls and must
+# therefore never be mutated; it's only ever handed to the packer.
+EMPTY_EXTRA = {}
+READ_EXTRA = {"mode": "r"}
+
+
+def build_tx_extra(mode, db, imp_user, bookmarks, metadata, timeout):
+    """ Build the extra of a RUN or BEGIN message from the transaction
+    configuration.
+    """
+    extra = {}
+    if mode in (READ_ACCESS, "r"):
+        # It will default to mode "w" if nothing is specified
+        extra["mode"] = "r"
+    if db:
+        extra["db"] = db
+    if imp_user:
+        extra["imp_user"] = imp_user
+    if bookmarks:
+        extra["bookmarks"] = coerce_bookmarks(bookmarks)
+    if metadata:
+        extra["tx_metadata"] = coerce_metadata(metadata)
+    if timeout is not None:
+        extra["tx_timeout"] = coerce_tx_timeout(timeout)
+    return extra
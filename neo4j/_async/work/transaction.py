@@ -30,6 +30,11 @@ __all__ = ("AsyncTransaction", "AsyncManagedTransaction")
 
 
 class _AsyncTransactionBase:
+    # If set, BEGIN is not flushed on its own but stays queued until the
+    # first RUN (or the COMMIT) is sent. A failing BEGIN is then reported by
+    # that call instead.
+    _pipelined_begin = False
+
     def __init__(self, connection, fetch_size, on_closed, on_error):
         self._connection = connection
         self._error_handling_connection = ConnectionErrorHandler(
@@ -42,6 +47,7 @@ class _AsyncTransactionBase:
         self._fetch_size = fetch_size
         self._on_closed = on_closed
         self._on_error = on_error
+        self._begin_pending = False
 
     async def _enter(self):
         return self
@@ -57,12 +63,23 @@ class _AsyncTransactionBase:
     async def _begin(
         self, database, imp_user, bookmarks, access_mode, metadata, timeout
     ):
-        self._connection.begin(
-            bookmarks=bookmarks, metadata=metadata, timeout=timeout,
-            mode=access_mode, db=database, imp_user=imp_user
-        )
-        await self._error_handling_connection.send_all()
-        await self._error_handling_connection.fetch_all()
+        if self._pipelined_begin:
+            self._begin_pending = True
+            self._connection.begin(
+                bookmarks=bookmarks, metadata=metadata, timeout=timeout,
+                mode=access_mode, db=database, imp_user=imp_user,
+                on_summary=self._on_begin_summary
+            )
+        else:
+            self._connection.begin(
+                bookmarks=bookmarks, metadata=metadata, timeout=timeout,
+                mode=access_mode, db=database, imp_user=imp_user
+            )
+            await self._error_handling_connection.send_all()
+            await self._error_handling_connection.fetch_all()
+
+    def _on_begin_summary(self):
+        self._begin_pending = False
 
     async def _result_on_closed_handler(self):
         pass
@@ -168,9 +185,13 @@ class _AsyncTransactionBase:
 
         metadata = {}
         try:
+            # A queued BEGIN has not reached the server yet, so the server
+            # still looks reset. It must be sent (and rolled back) anyway,
+            # else it stays queued on the connection.
             if not (self._connection.defunct()
                     or self._connection.closed()
-                    or self._connection.is_reset):
+                    or (not self._begin_pending
+                        and self._connection.is_reset)):
                 # DISCARD pending records then do a rollback.
                 await self._consume_results()
                 self._connection.rollback(on_success=metadata.update)
@@ -255,4 +276,5 @@ class AsyncManagedTransaction(_AsyncTransactionBase):
         but would cause hard to interpret errors when managed explicitly
         (committed or rolled back by user code).
     """
-    pass
+
+    _pipelined_begin = True
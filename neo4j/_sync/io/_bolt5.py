@@ -16,7 +16,11 @@
 # limitations under the License.
 
 
-from logging import getLogger
+from io import BytesIO
+from logging import (
+    DEBUG,
+    getLogger,
+)
 from ssl import SSLSocket
 
 from ..._async_compat.util import Util
@@ -36,15 +40,20 @@ from ...exceptions import (
     NotALeader,
     ServiceUnavailable,
 )
+from ...packstream import Packer
 from ._bolt3 import (
     ServerStateManager,
     ServerStates,
 )
 from ._bolt import Bolt
 from ._common import (
+    build_tx_extra,
     check_supported_server_product,
+    coerce_bookmarks,
     CommitResponse,
+    EMPTY_EXTRA,
     InitResponse,
+    READ_EXTRA,
     Response,
 )
 
@@ -52,6 +61,12 @@ from ._common import (
 log = getLogger("neo4j")
 
 
+def _pack_message(signature, fields=()):
+    stream = BytesIO()
+    Packer(stream).pack_struct(signature, fields)
+    return stream.getvalue()
+
+
 class Bolt5x0(Bolt):
     """Protocol handler for Bolt 5.0. """
 
@@ -61,29 +76,46 @@ class Bolt5x0(Bolt):
 
     supports_multiple_databases = True
 
+    # Messages without fields always encode to the same bytes.
+    _COMMIT_MESSAGE = _pack_message(b"\x12")
+    _ROLLBACK_MESSAGE = _pack_message(b"\x13")
+    _RESET_MESSAGE = _pack_message(b"\x0F")
+    _GOODBYE_MESSAGE = _pack_message(b"\x02")
+
+    _base_headers = None
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._server_state_manager = ServerStateManager(
             ServerStates.CONNECTED, on_change=self._on_server_state_change
         )
+        # The socket is fixed for the lifetime of the connection. Resolving
+        # these once saves a syscall for every (debug) log line.
+        self._encrypted = isinstance(self.socket, SSLSocket)
+        try:
+            self._local_port = self.socket.getsockname()[1]
+        except OSError:
+            self._local_port = 0
 
     def _on_server_state_change(self, old_state, new_state):
-        log.debug("[#%04X]  State: %s > %s", self.local_port,
-                  old_state.name, new_state.name)
+        if log.isEnabledFor(DEBUG):
+            log.debug("[#%04X]  State: %s > %s", self.local_port,
+                      old_state.name, new_state.name)
 
     @property
     def is_reset(self):
         # We can't be sure of the server's state if there are still pending
         # responses. Unless the last message we sent was RESET. In that case
         # the server state will always be READY when we're done.
-        if (self.responses and self.responses[-1]
-                and self.responses[-1].message == "reset"):
-            return True
-        return self._server_state_manager.state == ServerStates.READY
+        if self.responses:
+            last_response = self.responses[-1]
+            if last_response and last_response.message == "reset":
+                return True
+        return self._server_state_manager.state is ServerStates.READY
 
     @property
     def encrypted(self):
-        return isinstance(self.socket, SSLSocket)
+        return self._encrypted
 
     @property
     def der_encoded_server_certificate(self):
@@ -91,16 +123,21 @@ class Bolt5x0(Bolt):
 
     @property
     def local_port(self):
-        try:
-            return self.socket.getsockname()[1]
-        except OSError:
-            return 0
+        return self._local_port
 
     def get_base_headers(self):
-        headers = {"user_agent": self.user_agent}
-        if self.routing_context is not None:
-            headers["routing"] = self.routing_context
-        return headers
+        """Get the headers every HELLO message carries.
+
+        The user agent and routing context don't change over the lifetime of
+        the connection, so the headers are built once. The returned dict is
+        shared and must not be mutated.
+        """
+        if self._base_headers is None:
+            headers = {"user_agent": self.user_agent}
+            if self.routing_context is not None:
+                headers["routing"] = self.routing_context
+            self._base_headers = headers
+        return self._base_headers
 
     def hello(self):
         def on_success(metadata):
@@ -118,12 +155,13 @@ class Bolt5x0(Bolt):
                              "the server and network is set up correctly.",
                              self.local_port, recv_timeout)
 
-        headers = self.get_base_headers()
-        headers.update(self.auth_dict)
-        logged_headers = dict(headers)
-        if "credentials" in logged_headers:
-            logged_headers["credentials"] = "*******"
-        log.debug("[#%04X]  C: HELLO %r", self.local_port, logged_headers)
+        headers = {**self.get_base_headers(), **self.auth_dict}
+        if log.isEnabledFor(DEBUG):
+            if "credentials" in headers:
+                logged_headers = {**headers, "credentials": "*******"}
+            else:
+                logged_headers = headers
+            log.debug("[#%04X]  C: HELLO %r", self.local_port, logged_headers)
         self._append(b"\x01", (headers,),
                      response=InitResponse(self, "hello",
                                            on_success=on_success))
@@ -144,7 +182,7 @@ class Bolt5x0(Bolt):
         if bookmarks is None:
             bookmarks = []
         else:
-            bookmarks = list(bookmarks)
+            bookmarks = coerce_bookmarks(bookmarks)
         self._append(b"\x66", (routing_context, bookmarks, db_context),
                      response=Response(self, "route",
                                        on_success=metadata.update))
@@ -156,34 +194,13 @@ class Bolt5x0(Bolt):
             metadata=None, timeout=None, db=None, imp_user=None, **handlers):
         if not parameters:
             parameters = {}
-        extra = {}
-        if mode in (READ_ACCESS, "r"):
-            # It will default to mode "w" if nothing is specified
-            extra["mode"] = "r"
-        if db:
-            extra["db"] = db
-        if imp_user:
-            extra["imp_user"] = imp_user
-        if bookmarks:
-            try:
-                extra["bookmarks"] = list(bookmarks)
-            except TypeError:
-                raise TypeError("Bookmarks must be provided as iterable")
-        if metadata:
-            try:
-                extra["tx_metadata"] = dict(metadata)
-            except TypeError:
-                raise TypeError("Metadata must be coercible to a dict")
-        if timeout is not None:
-            try:
-                extra["tx_timeout"] = int(1000 * float(timeout))
-            except TypeError:
-                raise TypeError("Timeout must be a number (in seconds)")
-            if extra["tx_timeout"] < 0:
-                raise ValueError("Timeout must be a number <= 0")
+        if not (db or imp_user or bookmarks or metadata) and timeout is None:
+            extra = READ_EXTRA if mode in (READ_ACCESS, "r") else EMPTY_EXTRA
+        else:
+            extra = build_tx_extra(mode, db, imp_user, bookmarks, metadata,
+                                   timeout)
         fields = (query, parameters, extra)
-        log.debug("[#%04X]  C: RUN %s", self.local_port,
-                  " ".join(map(repr, fields)))
+        log.debug("[#%04X]  C: RUN %r %r %r", self.local_port, *fields)
         self._append(b"\x10", fields, Response(self, "run", **handlers))
 
     def discard(self, n=-1, qid=-1, **handlers):
@@ -202,41 +219,23 @@ class Bolt5x0(Bolt):
 
     def begin(self, mode=None, bookmarks=None, metadata=None, timeout=None,
               db=None, imp_user=None, **handlers):
-        extra = {}
-        if mode in (READ_ACCESS, "r"):
-            # It will default to mode "w" if nothing is specified
-            extra["mode"] = "r"
-        if db:
-            extra["db"] = db
-        if imp_user:
-            extra["imp_user"] = imp_user
-        if bookmarks:
-            try:
-                extra["bookmarks"] = list(bookmarks)
-            except TypeError:
-                raise TypeError("Bookmarks must be provided as iterable")
-        if metadata:
-            try:
-                extra["tx_metadata"] = dict(metadata)
-            except TypeError:
-                raise TypeError("Metadata must be coercible to a dict")
-        if timeout is not None:
-            try:
-                extra["tx_timeout"] = int(1000 * float(timeout))
-            except TypeError:
-                raise TypeError("Timeout must be a number (in seconds)")
-            if extra["tx_timeout"] < 0:
-                raise ValueError("Timeout must be a number <= 0")
+        if not (db or imp_user or bookmarks or metadata) and timeout is None:
+            extra = READ_EXTRA if mode in (READ_ACCESS, "r") else EMPTY_EXTRA
+        else:
+            extra = build_tx_extra(mode, db, imp_user, bookmarks, metadata,
+                                   timeout)
         log.debug("[#%04X]  C: BEGIN %r", self.local_port, extra)
         self._append(b"\x11", (extra,), Response(self, "begin", **handlers))
 
     def commit(self, **handlers):
         log.debug("[#%04X]  C: COMMIT", self.local_port)
-        self._append(b"\x12", (), CommitResponse(self, "commit", **handlers))
+        self._append_packed(self._COMMIT_MESSAGE,
+                            CommitResponse(self, "commit", **handlers))
 
     def rollback(self, **handlers):
         log.debug("[#%04X]  C: ROLLBACK", self.local_port)
-        self._append(b"\x13", (), Response(self, "rollback", **handlers))
+        self._append_packed(self._ROLLBACK_MESSAGE,
+                            Response(self, "rollback", **handlers))
 
     def reset(self):
         """Reset the connection.
@@ -244,20 +243,20 @@ class Bolt5x0(Bolt):
         Add a RESET message to the outgoing queue, send it and consume all
         remaining messages.
         """
-
-        def fail(metadata):
-            raise BoltProtocolError("RESET failed %r" % metadata,
-                                    self.unresolved_address)
-
         log.debug("[#%04X]  C: RESET", self.local_port)
-        self._append(b"\x0F", response=Response(self, "reset",
-                                                on_failure=fail))
+        self._append_packed(self._RESET_MESSAGE,
+                            Response(self, "reset",
+                                     on_failure=self._on_reset_failure))
         self.send_all()
         self.fetch_all()
 
+    def _on_reset_failure(self, metadata):
+        raise BoltProtocolError("RESET failed %r" % metadata,
+                                self.unresolved_address)
+
     def goodbye(self):
         log.debug("[#%04X]  C: GOODBYE", self.local_port)
-        self._append(b"\x02", ())
+        self._append_packed(self._GOODBYE_MESSAGE)
 
     def _process_message(self, details, summary_signature,
                                summary_metadata):
@@ -276,38 +275,50 @@ class Bolt5x0(Bolt):
 
         response = self.responses.popleft()
         response.complete = True
-        if summary_signature == b"\x70":
-            log.debug("[#%04X]  S: SUCCESS %r", self.local_port,
-                      summary_metadata)
-            self._server_state_manager.transition(response.message,
-                                                  summary_metadata)
-            response.on_success(summary_metadata or {})
-        elif summary_signature == b"\x7E":
-            log.debug("[#%04X]  S: IGNORED", self.local_port)
-            response.on_ignored(summary_metadata or {})
-        elif summary_signature == b"\x7F":
-            log.debug("[#%04X]  S: FAILURE %r", self.local_port,
-                      summary_metadata)
-            self._server_state_manager.state = ServerStates.FAILED
-            try:
-                response.on_failure(summary_metadata or {})
-            except (ServiceUnavailable, DatabaseUnavailable):
-                if self.pool:
-                    self.pool.deactivate(address=self.unresolved_address)
-                raise
-            except (NotALeader, ForbiddenOnReadOnlyDatabase):
-                if self.pool:
-                    self.pool.on_write_failure(address=self.unresolved_address)
-                raise
-            except Neo4jError as e:
-                if self.pool and e.invalidates_all_connections():
-                    self.pool.mark_all_stale()
-                raise
-        else:
+        handler = self._SUMMARY_HANDLERS.get(summary_signature)
+        if handler is None:
             raise BoltProtocolError(
                 "Unexpected response message with signature %02X" % ord(
                     summary_signature
                 ), self.unresolved_address
             )
+        handler(self, response, summary_metadata)
 
         return len(details), 1
+
+    def _handle_success(self, response, summary_metadata):
+        log.debug("[#%04X]  S: SUCCESS %r", self.local_port, summary_metadata)
+        self._server_state_manager.transition(response.message,
+                                              summary_metadata)
+        response.on_success(summary_metadata or {})
+
+    def _handle_ignored(self, response, summary_metadata):
+        log.debug("[#%04X]  S: IGNORED", self.local_port)
+        response.on_ignored(summary_metadata or {})
+
+    def _handle_failure(self, response, summary_metadata):
+        log.debug("[#%04X]  S: FAILURE %r", self.local_port, summary_metadata)
+        self._server_state_manager.state = ServerStates.FAILED
+        try:
+            response.on_failure(summary_metadata or {})
+        except (ServiceUnavailable, DatabaseUnavailable):
+            if self.pool:
+                self.pool.deactivate(address=self.unresolved_address)
+            raise
+        except (NotALeader, ForbiddenOnReadOnlyDatabase):
+            if self.pool:
+                self.pool.on_write_failure(address=self.unresolved_address)
+            raise
+        except Neo4jError as e:
+            if self.pool and e.invalidates_all_connections():
+                self.pool.mark_all_stale()
+            raise
+
+    # Summary message signature -> handler. The handlers are stored as plain
+    # functions; subclasses that need different handling must provide their
+    # own table.
+    _SUMMARY_HANDLERS = {
+        b"\x70": _handle_success,
+        b"\x7E": _handle_ignored,
+        b"\x7F": _handle_failure,
+    }
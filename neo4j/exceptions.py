@@ -66,10 +66,44 @@ Connector API Errors
 
 """
 
+
+from functools import lru_cache
+
+
 CLASSIFICATION_CLIENT = "ClientError"
 CLASSIFICATION_TRANSIENT = "TransientError"
 CLASSIFICATION_DATABASE = "DatabaseError"
 
+# Reported as a ClientError by the server, but handled as a TransientError
+# that also invalidates all pooled connections.
+_AUTHORIZATION_EXPIRED_CODE = "Neo.ClientError.Security.AuthorizationExpired"
+
+_NON_RETRIABLE_TRANSIENT_CODES = frozenset((
+    "Neo.TransientError.Transaction.Terminated",
+    "Neo.TransientError.Transaction.LockClientStopped",
+))
+
+_FATAL_DISCOVERY_CODES = frozenset((
+    "Neo.ClientError.Database.DatabaseNotFound",
+    "Neo.ClientError.Transaction.InvalidBookmark",
+    "Neo.ClientError.Transaction.InvalidBookmarkMixture",
+))
+
+
+@lru_cache(maxsize=256)
+def _parse_code(code):
+    # error codes come from a small, fixed set, so the split is only done
+    # once per distinct code
+    try:
+        _, classification, category, title = code.split(".")
+        if code == _AUTHORIZATION_EXPIRED_CODE:
+            classification = CLASSIFICATION_TRANSIENT
+    except ValueError:
+        classification = CLASSIFICATION_DATABASE
+        category = "General"
+        title = "UnknownError"
+    return classification, category, title
+
 
 class Neo4jError(Exception):
     """ Raised when the Cypher engine returns an error to the client.
@@ -91,15 +125,7 @@ class Neo4jError(Exception):
     def hydrate(cls, message=None, code=None, **metadata):
         message = message or "An unknown error occurred"
         code = code or "Neo.DatabaseError.General.UnknownError"
-        try:
-            _, classification, category, title = code.split(".")
-            if code == "Neo.ClientError.Security.AuthorizationExpired":
-                classification = CLASSIFICATION_TRANSIENT
-        except ValueError:
-            classification = CLASSIFICATION_DATABASE
-            category = "General"
-            title = "UnknownError"
-
+        classification, category, title = _parse_code(code)
         error_class = cls._extract_error_class(classification, code)
 
         inst = error_class(message)
@@ -113,23 +139,10 @@ class Neo4jError(Exception):
 
     @classmethod
     def _extract_error_class(cls, classification, code):
-        if classification == CLASSIFICATION_CLIENT:
-            try:
-                return client_errors[code]
-            except KeyError:
-                return ClientError
-
-        elif classification == CLASSIFICATION_TRANSIENT:
-            try:
-                return transient_errors[code]
-            except KeyError:
-                return TransientError
-
-        elif classification == CLASSIFICATION_DATABASE:
-            return DatabaseError
-
-        else:
-            return cls
+        error_class = _CODE_TO_CLASS.get(code)
+        if error_class is not None:
+            return error_class
+        return _CLASSIFICATION_TO_CLASS.get(classification, cls)
 
     def is_retriable(self):
         """Whether the error is retryable.
@@ -145,25 +158,21 @@ class Neo4jError(Exception):
         return False
 
     def invalidates_all_connections(self):
-        return self.code == "Neo.ClientError.Security.AuthorizationExpired"
+        return self.code == _AUTHORIZATION_EXPIRED_CODE
 
     def is_fatal_during_discovery(self):
         # checks if the code is an error that is caused by the client. In this
         # case the driver should fail fast during discovery.
-        if not isinstance(self.code, str):
+        code = self.code
+        if not isinstance(code, str):
             return False
-        if self.code in ("Neo.ClientError.Database.DatabaseNotFound",
-                         "Neo.ClientError.Transaction.InvalidBookmark",
-                         "Neo.ClientError.Transaction.InvalidBookmarkMixture"):
-            return True
-        if (self.code.startswith("Neo.ClientError.Security.")
-                and self.code != "Neo.ClientError.Security."
-                                 "AuthorizationExpired"):
+        if code in _FATAL_DISCOVERY_CODES:
             return True
-        return False
+        return (code.startswith("Neo.ClientError.Security.")
+                and code != _AUTHORIZATION_EXPIRED_CODE)
 
     def __str__(self):
-        return "{{code: {code}}} {{message: {message}}}".format(code=self.code, message=self.message)
+        return f"{{code: {self.code}}} {{message: {self.message}}}"
 
 
 class ClientError(Neo4jError):
@@ -184,10 +193,7 @@ class TransientError(Neo4jError):
         # Transient errors are always retriable.
         # However, there are some errors that are misclassified by the server.
         # They should really be ClientErrors.
-        return self.code not in (
-            "Neo.TransientError.Transaction.Terminated",
-            "Neo.TransientError.Transaction.LockClientStopped",
-        )
+        return self.code not in _NON_RETRIABLE_TRANSIENT_CODES
 
 
 class DatabaseUnavailable(TransientError):
@@ -279,6 +285,21 @@ transient_errors = {
     "Neo.TransientError.General.DatabaseUnavailable": DatabaseUnavailable
 }
 
+# Known codes mapped straight to their error class, so that hydrating them
+# doesn't need to go through the classification lookup.
+_CODE_TO_CLASS = {
+    **client_errors,
+    **transient_errors,
+    _AUTHORIZATION_EXPIRED_CODE: TransientError,
+}
+
+# Fallback for codes without a dedicated error class.
+_CLASSIFICATION_TO_CLASS = {
+    CLASSIFICATION_CLIENT: ClientError,
+    CLASSIFICATION_TRANSIENT: TransientError,
+    CLASSIFICATION_DATABASE: DatabaseError,
+}
+
 
 class DriverError(Exception):
     """ Raised when the Driver raises an error.
@@ -19,6 +19,7 @@
 from codecs import decode
 from struct import (
     pack as struct_pack,
+    Struct,
     unpack as struct_unpack,
 )
 
@@ -26,6 +27,16 @@ from struct import (
 PACKED_UINT_8 = [struct_pack(">B", value) for value in range(0x100)]
 PACKED_UINT_16 = [struct_pack(">H", value) for value in range(0x10000)]
 
+# pack a marker byte together with the value that follows it
+_pack_marker_int_8 = Struct(">Bb").pack
+_pack_marker_int_16 = Struct(">Bh").pack
+_pack_marker_int_32 = Struct(">Bi").pack
+_pack_marker_int_64 = Struct(">Bq").pack
+_pack_marker_float = Struct(">Bd").pack
+_pack_marker_uint_8 = Struct(">BB").pack
+_pack_marker_uint_16 = Struct(">BH").pack
+_pack_marker_uint_32 = Struct(">BI").pack
+
 UNPACKED_UINT_8 = {bytes(bytearray([x])): x for x in range(0x100)}
 UNPACKED_UINT_16 = {struct_pack(">H", x): x for x in range(0x10000)}
 
@@ -93,33 +104,32 @@ class Packer:
 
         # Float (only double precision is supported)
         elif isinstance(value, float):
-            write(b"\xC1")
-            write(struct_pack(">d", value))
+            write(_pack_marker_float(0xC1, value))
 
         # Integer
         elif isinstance(value, int):
             if -0x10 <= value < 0x80:
                 write(PACKED_UINT_8[value % 0x100])
             elif -0x80 <= value < -0x10:
-                write(b"\xC8")
-                write(PACKED_UINT_8[value % 0x100])
+                write(_pack_marker_int_8(0xC8, value))
             elif -0x8000 <= value < 0x8000:
-                write(b"\xC9")
-                write(PACKED_UINT_16[value % 0x10000])
+                write(_pack_marker_int_16(0xC9, value))
             elif -0x80000000 <= value < 0x80000000:
-                write(b"\xCA")
-                write(struct_pack(">i", value))
+                write(_pack_marker_int_32(0xCA, value))
             elif INT64_MIN <= value < INT64_MAX:
-                write(b"\xCB")
-                write(struct_pack(">q", value))
+                write(_pack_marker_int_64(0xCB, value))
             else:
                 raise OverflowError("Integer %s out of range" % value)
 
         # String
         elif isinstance(value, str):
             encoded = value.encode("utf-8")
-            self.pack_string_header(len(encoded))
-            self.pack_raw(encoded)
+            size = len(encoded)
+            if size <= 0x0F:
+                write(PACKED_UINT_8[0x80 | size])
+            else:
+                self.pack_string_header(size)
+            write(encoded)
 
         # Bytes
         elif isinstance(value, (bytes, bytearray)):
@@ -129,15 +139,17 @@ class Packer:
         # List
         elif isinstance(value, list):
             self.pack_list_header(len(value))
+            pack = self._pack
             for item in value:
-                self._pack(item)
+                pack(item)
 
         # Map
         elif isinstance(value, dict):
             self.pack_map_header(len(value))
+            pack = self._pack
             for key, item in value.items():
-                self._pack(key)
-                self._pack(item)
+                pack(key)
+                pack(item)
 
         # Structure
         elif isinstance(value, Structure):
@@ -150,62 +162,50 @@ class Packer:
     def pack_bytes_header(self, size):
         write = self._write
         if size < 0x100:
-            write(b"\xCC")
-            write(PACKED_UINT_8[size])
+            write(_pack_marker_uint_8(0xCC, size))
         elif size < 0x10000:
-            write(b"\xCD")
-            write(PACKED_UINT_16[size])
+            write(_pack_marker_uint_16(0xCD, size))
         elif size < 0x100000000:
-            write(b"\xCE")
-            write(struct_pack(">I", size))
+            write(_pack_marker_uint_32(0xCE, size))
         else:
             raise OverflowError("Bytes header size out of range")
 
     def pack_string_header(self, size):
         write = self._write
         if size <= 0x0F:
-            write(bytes((0x80 | size,)))
+            write(PACKED_UINT_8[0x80 | size])
         elif size < 0x100:
-            write(b"\xD0")
-            write(PACKED_UINT_8[size])
+            write(_pack_marker_uint_8(0xD0, size))
         elif size < 0x10000:
-            write(b"\xD1")
-            write(PACKED_UINT_16[size])
+            write(_pack_marker_uint_16(0xD1, size))
         elif size < 0x100000000:
-            write(b"\xD2")
-            write(struct_pack(">I", size))
+            write(_pack_marker_uint_32(0xD2, size))
         else:
             raise OverflowError("String header size out of range")
 
     def pack_list_header(self, size):
         write = self._write
         if size <= 0x0F:
-            write(bytes((0x90 | size,)))
+            write(PACKED_UINT_8[0x90 | size])
         elif size < 0x100:
-            write(b"\xD4")
-            write(PACKED_UINT_8[size])
+            write(_pack_marker_uint_8(0xD4, size))
         elif size < 0x10000:
-            write(b"\xD5")
-            write(PACKED_UINT_16[size])
+            write(_pack_marker_uint_16(0xD5, size))
         elif size < 0x100000000:
-            write(b"\xD6")
-            write(struct_pack(">I", size))
+            write(_pack_marker_uint_32(0xD6, size))
         else:
             raise OverflowError("List header size out of range")
 
     def pack_map_header(self, size):
         write = self._write
         if size <= 0x0F:
-            write(bytes((0xA0 | size,)))
+            write(PACKED_UINT_8[0xA0 | size])
         elif size < 0x100:
-            write(b"\xD8")
-            write(PACKED_UINT_8[size])
+            write(_pack_marker_uint_8(0xD8, size))
         elif size < 0x10000:
-            write(b"\xD9")
-            write(PACKED_UINT_16[size])
+            write(_pack_marker_uint_16(0xD9, size))
         elif size < 0x100000000:
-            write(b"\xDA")
-            write(struct_pack(">I", size))
+            write(_pack_marker_uint_32(0xDA, size))
         else:
             raise OverflowError("Map header size out of range")
 
@@ -215,7 +215,7 @@ class Packer:
         write = self._write
         size = len(fields)
         if size <= 0x0F:
-            write(bytes((0xB0 | size,)))
+            write(PACKED_UINT_8[0xB0 | size])
         else:
             raise OverflowError("Structure size out of range")
         write(signature)
@@ -240,6 +240,12 @@ class Unpacker:
     def unpack(self):
         return self._unpack()
 
+    def unpack_n(self, n):
+        """ Unpack the next n values and return them as a list.
+        """
+        unpack = self._unpack
+        return [unpack() for _ in range(n)]
+
     def _unpack(self):
         marker = self.read_u8()
 
@@ -314,10 +320,7 @@ class Unpacker:
             # Structure
             elif 0xB0 <= marker <= 0xBF:
                 size, tag = self._unpack_structure_header(marker)
-                value = Structure(tag, *([None] * size))
-                for i in range(len(value)):
-                    value[i] = self._unpack()
-                return value
+                return Structure(tag, *self.unpack_n(size))
 
             else:
                 raise ValueError("Unknown PackStream marker %02X" % marker)
@@ -395,8 +398,10 @@ class Unpacker:
     def _unpack_structure_header(self, marker):
         marker_high = marker & 0xF0
         if marker_high == 0xB0:  # TINY_STRUCT
-            signature = self.read(1).tobytes()
-            return marker & 0x0F, signature
+            signature = self.read_u8()
+            if signature == -1:
+                raise ValueError("Nothing to unpack")
+            return marker & 0x0F, PACKED_UINT_8[signature]
         else:
             raise ValueError("Expected structure, found marker %02X" % marker)
 
@@ -16,9 +16,15 @@
 # limitations under the License.
 
 
+import logging
+
 import pytest
 
-from neo4j._async.io._bolt3 import AsyncBolt3
+from neo4j._async.io._bolt3 import (
+    AsyncBolt3,
+    ServerStateManager,
+    ServerStates,
+)
 from neo4j.conf import PoolConfig
 from neo4j.exceptions import ConfigurationError
 
@@ -110,3 +116,46 @@ async def test_hint_recv_timeout_seconds_gets_ignored(
     )
     await connection.hello()
     sockets.client.settimeout.assert_not_called()
+
+
+@pytest.mark.parametrize(("state", "message", "metadata", "expected"), (
+    (ServerStates.CONNECTED, "hello", {}, ServerStates.READY),
+    (ServerStates.READY, "run", {}, ServerStates.STREAMING),
+    (ServerStates.READY, "begin", {}, ServerStates.TX_READY_OR_TX_STREAMING),
+    (ServerStates.STREAMING, "pull", {}, ServerStates.READY),
+    (ServerStates.STREAMING, "pull", {"has_more": True},
+     ServerStates.STREAMING),
+    (ServerStates.TX_READY_OR_TX_STREAMING, "pull", {},
+     ServerStates.TX_READY_OR_TX_STREAMING),
+    (ServerStates.TX_READY_OR_TX_STREAMING, "commit", {}, ServerStates.READY),
+    (ServerStates.FAILED, "run", {}, ServerStates.FAILED),
+    (ServerStates.FAILED, "reset", {}, ServerStates.READY),
+))
+def test_server_state_transition(state, message, metadata, expected, mocker):
+    on_change = mocker.Mock()
+    manager = ServerStateManager(state, on_change=on_change)
+    manager.transition(message, metadata)
+    assert manager.state is expected
+    if expected is state:
+        on_change.assert_not_called()
+    else:
+        on_change.assert_called_once_with(state, expected)
+
+
+@mark_async_test
+async def test_hello_does_not_log_credentials(fake_socket_pair, caplog):
+    address = ("127.0.0.1", 7687)
+    sockets = fake_socket_pair(address)
+    await sockets.server.send_message(0x70, {"server": "Neo4j/3.5.0"})
+    connection = AsyncBolt3(
+        address, sockets.client, PoolConfig.max_connection_lifetime,
+        auth=("user", "super secret")
+    )
+    with caplog.at_level(logging.DEBUG):
+        await connection.hello()
+    tag, fields = await sockets.server.pop_message()
+    assert tag == 0x01
+    assert fields[0]["credentials"] == "super secret"
+    assert any("C: HELLO" in msg and "'*******'" in msg
+               for msg in caplog.messages)
+    assert not any("super secret" in msg for msg in caplog.messages)
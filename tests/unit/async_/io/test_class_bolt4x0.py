@@ -19,6 +19,8 @@
 import pytest
 
 from neo4j._async.io._bolt4 import AsyncBolt4x0
+from neo4j._async.io._common import Response
+from neo4j._exceptions import BoltProtocolError
 from neo4j.conf import PoolConfig
 
 from ...._async_compat import mark_async_test
@@ -82,6 +84,29 @@ async def test_db_extra_in_run(fake_socket):
     assert fields[2] == {"db": "something"}
 
 
+@pytest.mark.parametrize(("mode", "expected_extra"), (
+    (None, {}),
+    ("w", {}),
+    ("WRITE", {}),
+    ("r", {"mode": "r"}),
+    ("READ", {"mode": "r"}),
+))
+@mark_async_test
+async def test_mode_extra_in_begin_and_run(fake_socket, mode, expected_extra):
+    address = ("127.0.0.1", 7687)
+    socket = fake_socket(address)
+    connection = AsyncBolt4x0(address, socket, PoolConfig.max_connection_lifetime)
+    connection.begin(mode=mode)
+    connection.run("", {}, mode=mode)
+    await connection.send_all()
+    tag, fields = await socket.pop_message()
+    assert tag == b"\x11"
+    assert fields == [expected_extra]
+    tag, fields = await socket.pop_message()
+    assert tag == b"\x10"
+    assert fields == ["", {}, expected_extra]
+
+
 @mark_async_test
 async def test_n_extra_in_discard(fake_socket):
     address = ("127.0.0.1", 7687)
@@ -205,3 +230,80 @@ async def test_hint_recv_timeout_seconds_gets_ignored(
     )
     await connection.hello()
     sockets.client.settimeout.assert_not_called()
+
+
+@mark_async_test
+async def test_local_port_is_resolved_once(fake_socket, mocker):
+    address = ("127.0.0.1", 7687)
+    socket = fake_socket(address)
+    socket.getsockname = mocker.MagicMock(return_value=("127.0.0.1", 4321))
+    connection = AsyncBolt4x0(address, socket, PoolConfig.max_connection_lifetime)
+    connection.begin()
+    connection.run("RETURN 1")
+    connection.pull()
+    await connection.send_all()
+    assert connection.local_port == 4321
+    socket.getsockname.assert_called_once_with()
+
+
+def test_local_port_defaults_to_0(fake_socket, mocker):
+    address = ("127.0.0.1", 7687)
+    socket = fake_socket(address)
+    socket.getsockname = mocker.MagicMock(side_effect=OSError)
+    connection = AsyncBolt4x0(address, socket, PoolConfig.max_connection_lifetime)
+    assert connection.local_port == 0
+
+
+@pytest.mark.parametrize(("signature", "handler"), (
+    (0x70, "on_success"),
+    (0x7E, "on_ignored"),
+))
+@mark_async_test
+async def test_summary_dispatch(fake_socket_pair, signature, handler, mocker):
+    address = ("127.0.0.1", 7687)
+    sockets = fake_socket_pair(address)
+    await sockets.server.send_message(signature, {"foo": "bar"})
+    connection = AsyncBolt4x0(
+        address, sockets.client, PoolConfig.max_connection_lifetime
+    )
+    callback = mocker.Mock()
+    connection.pull(**{handler: callback})
+    await connection.send_all()
+    await connection.fetch_all()
+    callback.assert_called_once_with({"foo": "bar"})
+
+
+@mark_async_test
+async def test_unexpected_summary_signature(fake_socket_pair):
+    address = ("127.0.0.1", 7687)
+    sockets = fake_socket_pair(address)
+    await sockets.server.send_message(0x7A, {})
+    connection = AsyncBolt4x0(
+        address, sockets.client, PoolConfig.max_connection_lifetime
+    )
+    connection.pull()
+    await connection.send_all()
+    with pytest.raises(BoltProtocolError, match="7A"):
+        await connection.fetch_all()
+
+
+@mark_async_test
+async def test_is_reset(fake_socket_pair):
+    address = ("127.0.0.1", 7687)
+    sockets = fake_socket_pair(address)
+    await sockets.server.send_message(0x70, {"server": "Neo4j/4.0.0"})
+    await sockets.server.send_message(0x70, {})
+    connection = AsyncBolt4x0(
+        address, sockets.client, PoolConfig.max_connection_lifetime
+    )
+    assert not connection.is_reset
+    await connection.hello()
+    assert connection.is_reset
+    connection.begin()
+    await connection.send_all()
+    await connection.fetch_all()
+    assert not connection.is_reset
+    connection.goodbye()
+    assert not connection.is_reset
+    connection.responses.append(Response(connection, "reset"))
+    assert connection.is_reset
@@ -64,6 +64,14 @@ def test_conn_is_not_stale(fake_socket, set_stale):
         {"db": "something", "imp_user": "imposter"},
         ({"db": "something", "imp_user": "imposter"},)
     ),
+    ((), {"bookmarks": ["a", "b"]}, ({"bookmarks": ["a", "b"]},)),
+    ((), {"bookmarks": ("a", "b")}, ({"bookmarks": ["a", "b"]},)),
+    ((), {"metadata": {"foo": "bar"}}, ({"tx_metadata": {"foo": "bar"}},)),
+    ((), {"metadata": [("foo", "bar")]}, ({"tx_metadata": {"foo": "bar"}},)),
+    ((), {"timeout": 0}, ({"tx_timeout": 0},)),
+    ((), {"timeout": 2}, ({"tx_timeout": 2000},)),
+    ((), {"timeout": 1.25}, ({"tx_timeout": 1250},)),
+    ((), {"timeout": "1.5"}, ({"tx_timeout": 1500},)),
 ))
 @mark_async_test
 async def test_extra_in_begin(fake_socket, args, kwargs, expected_fields):
@@ -98,6 +106,23 @@ async def test_extra_in_run(fake_socket, args, kwargs, expected_fields):
     assert tuple(is_fields) == expected_fields
 
 
+@pytest.mark.parametrize(("kwargs", "error"), (
+    ({"bookmarks": 1}, TypeError),
+    ({"metadata": 1}, TypeError),
+    ({"timeout": None, "metadata": [1]}, TypeError),
+    ({"timeout": [1]}, TypeError),
+    ({"timeout": -1}, ValueError),
+))
+@pytest.mark.parametrize("message", ("begin", "run"))
+def test_invalid_extra(fake_socket, kwargs, error, message):
+    address = ("127.0.0.1", 7687)
+    socket = fake_socket(address)
+    connection = AsyncBolt4x4(address, socket, PoolConfig.max_connection_lifetime)
+    args = ("RETURN 1",) if message == "run" else ()
+    with pytest.raises(error):
+        getattr(connection, message)(*args, **kwargs)
+
+
 @mark_async_test
 async def test_n_extra_in_discard(fake_socket):
     address = ("127.0.0.1", 7687)
@@ -265,3 +290,51 @@ async def test_hint_recv_timeout_seconds(
                    and "recv_timeout_seconds" in msg
                    and "invalid" in msg
                    for msg in caplog.messages)
+
+
+@mark_async_test
+async def test_hello_does_not_log_credentials(fake_socket_pair, caplog):
+    address = ("127.0.0.1", 7687)
+    sockets = fake_socket_pair(address)
+    await sockets.server.send_message(0x70, {"server": "Neo4j/4.4.0"})
+    connection = AsyncBolt4x4(
+        address, sockets.client, PoolConfig.max_connection_lifetime,
+        auth=("user", "super secret")
+    )
+    with caplog.at_level(logging.DEBUG):
+        await connection.hello()
+    tag, fields = await sockets.server.pop_message()
+    assert tag == 0x01
+    assert fields[0]["credentials"] == "super secret"
+    assert any("C: HELLO" in msg and "'*******'" in msg
+               for msg in caplog.messages)
+    assert not any("super secret" in msg for msg in caplog.messages)
+
+
+def test_run_logs_fields(fake_socket, caplog):
+    address = ("127.0.0.1", 7687)
+    socket = fake_socket(address)
+    connection = AsyncBolt4x4(address, socket, PoolConfig.max_connection_lifetime)
+    with caplog.at_level(logging.DEBUG):
+        connection.run("RETURN $x", {"x": 1}, db="foo")
+    assert any(
+        "C: RUN 'RETURN $x' {'x': 1} {'db': 'foo'}" in msg
+        for msg in caplog.messages
+    )
+
+
+@mark_async_test
+async def test_hello_does_not_alter_base_headers(fake_socket_pair):
+    address = ("127.0.0.1", 7687)
+    sockets = fake_socket_pair(address)
+    await sockets.server.send_message(0x70, {"server": "Neo4j/4.4.0"})
+    connection = AsyncBolt4x4(
+        address, sockets.client, PoolConfig.max_connection_lifetime,
+        auth=("user", "password"), routing_context={"foo": "bar"}
+    )
+    base_headers = connection.get_base_headers()
+    await connection.hello()
+    assert connection.get_base_headers() is base_headers
+    assert base_headers == {
+        "user_agent": connection.user_agent, "routing": {"foo": "bar"}
+    }
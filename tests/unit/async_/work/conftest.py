@@ -1,3 +1,4 @@
+from ..io.conftest import fake_socket_pair
 from ._fake_connection import (
     async_fake_connection,
     async_fake_connection_generator,
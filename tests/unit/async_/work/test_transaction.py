@@ -22,9 +22,12 @@ from uuid import uuid4
 import pytest
 
 from neo4j import (
+    AsyncManagedTransaction,
     AsyncTransaction,
     Query,
 )
+from neo4j._async.io._bolt5 import AsyncBolt5x0
+from neo4j.conf import PoolConfig
 
 from ...._async_compat import mark_async_test
 
@@ -209,3 +212,74 @@ async def test_transaction_no_rollback_on_defunct_connections(
         async_fake_connection.is_reset_mock.assert_not_called()
         async_fake_connection.reset.assert_not_called()
         async_fake_connection.rollback.assert_not_called()
+
+
+@pytest.mark.parametrize(("tx_cls", "pipelined"), (
+    (AsyncTransaction, False),
+    (AsyncManagedTransaction, True),
+))
+@mark_async_test
+async def test_transaction_begin_pipelining(
+    async_fake_connection, tx_cls, pipelined
+):
+    tx = tx_cls(
+        async_fake_connection, 2, lambda *args, **kwargs: None,
+        lambda *args, **kwargs: None
+    )
+    await tx._begin(None, None, None, "r", None, None)
+    async_fake_connection.begin.assert_called_once()
+    if pipelined:
+        async_fake_connection.send_all.assert_not_called()
+    else:
+        async_fake_connection.send_all.assert_called_once()
+    await tx.run("RETURN 1")
+    # BEGIN, RUN, and PULL go out in a single flush when pipelined
+    assert async_fake_connection.send_all.call_count == 1 + (not pipelined)
+
+
+@mark_async_test
+async def test_managed_transaction_rolls_back_queued_begin(
+    async_fake_connection
+):
+    tx = AsyncManagedTransaction(
+        async_fake_connection, 2, lambda *args, **kwargs: None,
+        lambda *args, **kwargs: None
+    )
+    await tx._begin(None, None, None, "r", None, None)
+    # BEGIN is still queued, so the server looks reset
+    async_fake_connection.is_reset_mock.return_value = True
+    await tx._close()
+    async_fake_connection.rollback.assert_called_once()
+    async_fake_connection.send_all.assert_called_once()
+
+
+
+@mark_async_test
+async def test_managed_transaction_sends_queued_begin_on_rollback(
+    fake_socket_pair
+):
+    address = ("127.0.0.1", 7687)
+    sockets = fake_socket_pair(address)
+    # answers to HELLO, BEGIN and ROLLBACK
+    await sockets.server.send_message(0x70, {"server": "Neo4j/5.0.0"})
+    await sockets.server.send_message(0x70, {})
+    await sockets.server.send_message(0x70, {})
+    connection = AsyncBolt5x0(
+        address, sockets.client, PoolConfig.max_connection_lifetime
+    )
+    await connection.hello()
+    tag, _ = await sockets.server.pop_message()
+    assert tag == 0x01
+    tx = AsyncManagedTransaction(
+        connection, 2, lambda *args, **kwargs: None,
+        lambda *args, **kwargs: None
+    )
+    await tx._begin(None, None, None, "r", None, None)
+    # the transaction function raised before running a query
+    await tx._close()
+    tag, _ = await sockets.server.pop_message()
+    assert tag == 0x11
+    tag, _ = await sockets.server.pop_message()
+    assert tag == 0x13
+    assert not connection.responses
+    assert connection.is_reset
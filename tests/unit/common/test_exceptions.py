@@ -54,6 +54,7 @@ from neo4j.exceptions import (
     RoutingServiceUnavailable,
     ServiceUnavailable,
     SessionExpired,
+    TokenExpired,
     TransactionError,
     TransactionNestingError,
     TransientError,
@@ -211,6 +212,28 @@ def test_neo4jerror_hydrate_with_message_and_code_client():
     assert error.code == "Neo.{}.General.TestError".format(CLASSIFICATION_CLIENT)
 
 
+@pytest.mark.parametrize(("code", "error_class", "classification"), (
+    ("Neo.ClientError.Statement.SyntaxError", CypherSyntaxError,
+     CLASSIFICATION_CLIENT),
+    ("Neo.ClientError.Security.TokenExpired", TokenExpired,
+     CLASSIFICATION_CLIENT),
+    ("Neo.ClientError.Cluster.NotALeader", NotALeader, CLASSIFICATION_CLIENT),
+    ("Neo.TransientError.General.DatabaseUnavailable", DatabaseUnavailable,
+     CLASSIFICATION_TRANSIENT),
+    ("Neo.ClientError.Security.AuthorizationExpired", TransientError,
+     CLASSIFICATION_TRANSIENT),
+))
+def test_neo4jerror_hydrate_with_known_code(code, error_class,
+                                            classification):
+    for _ in range(2):  # parsed codes are cached
+        error = Neo4jError.hydrate(message="Test error message", code=code)
+
+        assert type(error) is error_class
+        assert error.classification == classification
+        assert error.code == code
+        assert error.title == code.split(".")[-1]
+
+
 def test_transient_error_is_retriable_case_1():
     error = Neo4jError.hydrate(message="Test error message", code="Neo.TransientError.Transaction.Terminated")
 
@@ -230,3 +253,53 @@ def test_transient_error_is_retriable_case_3():
 
     assert isinstance(error, TransientError)
     assert error.is_retriable() is True
+
+
+@pytest.mark.parametrize(("code", "expected"), (
+    ("Neo.ClientError.Database.DatabaseNotFound", True),
+    ("Neo.ClientError.Transaction.InvalidBookmark", True),
+    ("Neo.ClientError.Transaction.InvalidBookmarkMixture", True),
+    ("Neo.ClientError.Security.Unauthorized", True),
+    ("Neo.ClientError.Security.AuthorizationExpired", False),
+    ("Neo.ClientError.Statement.SyntaxError", False),
+    ("Neo.TransientError.General.DatabaseUnavailable", False),
+))
+def test_neo4jerror_is_fatal_during_discovery(code, expected):
+    error = Neo4jError.hydrate(message="Test error message", code=code)
+
+    assert error.is_fatal_during_discovery() is expected
+
+
+def test_neo4jerror_without_code_is_not_fatal_during_discovery():
+    error = Neo4jError("Test error message")
+
+    assert error.is_fatal_during_discovery() is False
+
+
+def test_neo4jerror_str():
+    error = Neo4jError.hydrate(message="Test error message",
+                               code="Neo.ClientError.General.TestError")
+
+    assert str(error) == ("{code: Neo.ClientError.General.TestError} "
+                          "{message: Test error message}")
+
+
+@pytest.mark.parametrize(("code", "expected"), (
+    ("Neo.ClientError.Security.AuthorizationExpired", True),
+    ("Neo.ClientError.Security.TokenExpired", False),
+    ("Neo.TransientError.General.DatabaseUnavailable", False),
+))
+def test_neo4jerror_invalidates_all_connections(code, expected):
+    error = Neo4jError.hydrate(message="Test error message", code=code)
+
+    assert error.invalidates_all_connections() is expected
+
+
+def test_neo4jerror_hydrate_with_unknown_classification():
+    error = Neo4jError.hydrate(message="Test error message",
+                               code="Neo.FooError.General.TestError")
+
+    assert type(error) is Neo4jError
+    assert error.classification == "FooError"
+    assert error.category == "General"
+    assert error.title == "TestError"
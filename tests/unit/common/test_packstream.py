@@ -0,0 +1,86 @@
+# Copyright (c) "Neo4j"
+# Neo4j Sweden AB [https://neo4j.com]
+#
+# This file is part of Neo4j.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from io import BytesIO
+
+import pytest
+
+from neo4j.packstream import (
+    Packer,
+    Structure,
+    UnpackableBuffer,
+    Unpacker,
+)
+
+
+def pack(value):
+    stream = BytesIO()
+    Packer(stream).pack(value)
+    return stream.getvalue()
+
+
+def unpack(data):
+    return Unpacker(UnpackableBuffer(data)).unpack()
+
+
+@pytest.mark.parametrize(("value", "expected"), (
+    ("", b"\x80"),
+    ("a", b"\x81a"),
+    ("a" * 15, b"\x8F" + b"a" * 15),
+    ("a" * 16, b"\xD0\x10" + b"a" * 16),
+    ("ä", b"\x82\xC3\xA4"),
+    ([], b"\x90"),
+    ([1, 2], b"\x92\x01\x02"),
+    ([0] * 15, b"\x9F" + b"\x00" * 15),
+    ([0] * 16, b"\xD4\x10" + b"\x00" * 16),
+    ({}, b"\xA0"),
+    ({"a": 1}, b"\xA1\x81a\x01"),
+    (Structure(b"\x01"), b"\xB0\x01"),
+    (Structure(b"\x01", 1, "a"), b"\xB2\x01\x01\x81a"),
+))
+def test_pack(value, expected):
+    assert pack(value) == expected
+
+
+@pytest.mark.parametrize("value", (
+    None, True, False, 0, -1, 2 ** 62, 1.5, "", "a" * 15, "a" * 16,
+    "a" * 300, [1, "two", [3.0]], {"a": {"b": ["c", None]}},
+    {str(i): i for i in range(20)},
+))
+def test_round_trip(value):
+    assert unpack(pack(value)) == value
+
+
+def test_unpack_n():
+    data = pack(1) + pack("two") + pack([3.0]) + pack(None)
+    unpacker = Unpacker(UnpackableBuffer(data))
+    assert unpacker.unpack_n(3) == [1, "two", [3.0]]
+    assert unpacker.unpack_n(0) == []
+    assert unpacker.unpack() is None
+
+
+def test_unpack_structure_header():
+    unpacker = Unpacker(UnpackableBuffer(b"\xB1\x71\x01"))
+    assert unpacker.unpack_structure_header() == (1, b"\x71")
+    assert unpacker.unpack() == 1
+
+
+def test_unpack_structure_header_without_signature():
+    unpacker = Unpacker(UnpackableBuffer(b"\xB1"))
+    with pytest.raises(ValueError):
+        unpacker.unpack_structure_header()
@@ -16,9 +16,21 @@
 # limitations under the License.
 
 
+import asyncio
+import logging
+
 import pytest
 
-from neo4j._sync.io._common import Outbox
+from neo4j._sync.io._common import (
+    coerce_tx_timeout,
+    ConnectionErrorHandler,
+    MessageInbox,
+    Outbox,
+    Response,
+)
+from neo4j.exceptions import ServiceUnavailable
+
+from ...._async_compat import mark_sync_test
 
 
 @pytest.mark.parametrize(("chunk_size", "data", "result"), (
@@ -37,6 +49,16 @@ from neo4j._sync.io._common import Outbox
         (bytes((5, 6, 7)), bytes((8, 9))),
         bytes((0, 2, 5, 6, 0, 2, 7, 8, 0, 1, 9))
     ),
+    (
+        2,
+        (bytes((5, 6)),),
+        bytes((0, 2, 5, 6))
+    ),
+    (
+        16384,
+        (bytes((5, 6, 7)), bytes((8, 9))),
+        bytes((0, 5, 5, 6, 7, 8, 9))
+    ),
 ))
 def test_async_outbox_chunking(chunk_size, data, result):
     outbox = Outbox(max_chunk_size=chunk_size)
@@ -48,3 +70,205 @@ def test_async_outbox_chunking(chunk_size, data, result):
     assert bytes(outbox.view()) == result
     outbox.clear()
     assert bytes(outbox.view()) == b""
+
+
+@pytest.mark.parametrize(("timeout", "expected"), (
+    (0, 0),
+    (3, 3000),
+    (0.5, 500),
+    (True, 1000),
+    ("2.5", 2500),
+))
+def test_coerce_tx_timeout(timeout, expected):
+    tx_timeout = coerce_tx_timeout(timeout)
+    assert tx_timeout == expected
+    assert type(tx_timeout) is int
+
+
+@pytest.mark.parametrize(("timeout", "error"), (
+    (-1, ValueError),
+    (-0.5, ValueError),
+    ("foo", ValueError),
+    (object(), TypeError),
+    ([1], TypeError),
+))
+def test_coerce_tx_timeout_fails(timeout, error):
+    with pytest.raises(error):
+        coerce_tx_timeout(timeout)
+
+
+@mark_sync_test
+def test_connection_error_handler(mocker):
+    class Connection:
+        most_recent_qid = -1
+
+        def fetch_all(self):
+            raise ServiceUnavailable("Connection lost")
+
+        def pull(self, n=-1):
+            return n
+
+        def fetch_message(self):
+            return 1, 0
+
+    connection = Connection()
+    on_error = mocker.Mock()
+    handler = ConnectionErrorHandler(connection, on_error)
+    # wrappers are built once per method
+    assert handler.fetch_all is handler.fetch_all
+    with pytest.raises(ServiceUnavailable) as exc:
+        handler.fetch_all()
+    on_error.assert_called_once_with(exc.value)
+    # return values are passed through
+    assert handler.pull(n=100) == 100
+    assert handler.fetch_message() == (1, 0)
+    # plain attributes are passed through
+    handler.most_recent_qid = 5
+    assert connection.most_recent_qid == 5
+    assert handler.most_recent_qid == 5
+    # replacing a method drops the wrapper around the old one
+    assert handler.pull(n=1) == 1
+    handler.pull = lambda n=-1: "new"
+    assert handler.pull() == "new"
+
+
+@mark_sync_test
+def test_response_handlers(mocker):
+    on_records = mocker.Mock()
+    on_success = mocker.Mock()
+    on_summary = mocker.Mock()
+    response = Response(None, "pull", on_records=on_records,
+                        on_success=on_success, on_summary=on_summary)
+    response.on_records([[1]])
+    response.on_records([[2]])
+    response.on_success({"has_more": True})
+    on_summary.assert_not_called()
+    response.on_success({"bookmark": "foo"})
+    response.on_ignored({})
+    assert on_records.call_args_list == [mocker.call([[1]]),
+                                         mocker.call([[2]])]
+    assert on_success.call_args_list == [mocker.call({"has_more": True}),
+                                         mocker.call({"bookmark": "foo"})]
+    assert on_summary.call_count == 2
+
+
+@mark_sync_test
+def test_response_without_handlers():
+    response = Response(None, "pull", on_success=None)
+    response.on_records([[1]])
+    response.on_success({})
+    response.on_ignored()
+
+
+@mark_sync_test
+def test_inbox_resolves_local_port_once_for_noops(
+    fake_socket, mocker, caplog
+):
+    socket = fake_socket(("127.0.0.1", 7687))
+    socket.getsockname = mocker.MagicMock(return_value=("127.0.0.1", 4321))
+    # three NOOPs followed by an empty IGNORED message
+    socket.captured = b"\x00\x00" * 3 + b"\x00\x02\xB0\x7E\x00\x00"
+    with caplog.at_level(logging.DEBUG, logger="neo4j"):
+        tag, fields = socket.pop_message()
+    assert tag == b"\x7E"
+    assert fields == []
+    assert sum("S: <NOOP>" in msg for msg in caplog.messages) == 3
+    socket.getsockname.assert_called_once_with()
+
+
+@mark_sync_test
+def test_inbox_skips_local_port_for_noops_without_debug(
+    fake_socket, mocker, caplog
+):
+    socket = fake_socket(("127.0.0.1", 7687))
+    socket.getsockname = mocker.MagicMock(return_value=("127.0.0.1", 4321))
+    socket.captured = b"\x00\x00" * 3 + b"\x00\x02\xB0\x7E\x00\x00"
+    with caplog.at_level(logging.INFO, logger="neo4j"):
+        tag, fields = socket.pop_message()
+    assert tag == b"\x7E"
+    socket.getsockname.assert_not_called()
+
+
+@mark_sync_test
+def test_inbox_stops_after_read_error(fake_socket, mocker):
+    socket = fake_socket(("127.0.0.1", 7687))
+    socket.messages.on_error = mocker.Mock()
+    # one SUCCESS message, then the connection is closed
+    socket.captured = b"\x00\x03\xB1\x70\xA0\x00\x00"
+    assert socket.pop_message() == (b"\x70", [{}])
+    for _ in range(2):
+        with pytest.raises(StopIteration):
+            socket.pop_message()
+    socket.messages.on_error.assert_called_once()
+
+
+@mark_sync_test
+def test_inbox_reads_ahead(fake_socket_2, mocker):
+    socket = fake_socket_2(("127.0.0.1", 7687))
+    # a NOOP, a SUCCESS and an IGNORED message
+    socket.inject(b"\x00\x00" b"\x00\x03\xB1\x70\xA0\x00\x00"
+                  b"\x00\x02\xB0\x7E\x00\x00")
+    recv_into = mocker.spy(socket, "recv_into")
+    inbox = MessageInbox(socket, on_error=print)
+    assert inbox.pop() == (b"\x70", [{}])
+    assert inbox.pop() == (b"\x7E", [])
+    assert recv_into.call_count == 1
+
+
+@mark_sync_test
+def test_inbox_reads_large_chunks_directly(fake_socket_2, mocker):
+    socket = fake_socket_2(("127.0.0.1", 7687))
+    # a single chunk larger than the read-ahead buffer
+    value = b"x" * 10000
+    data = b"\xB1\x71\xCD\x27\x10" + value
+    socket.inject(len(data).to_bytes(2, "big") + data + b"\x00\x00")
+    inbox = MessageInbox(socket, on_error=print)
+    assert inbox.pop() == (b"\x71", [value])
+
+
+@mark_sync_test
+def test_inbox_stops_after_interrupted_read(fake_socket_2, mocker):
+    socket = fake_socket_2(("127.0.0.1", 7687))
+    # only the chunk header of a SUCCESS message arrives at first
+    socket.inject(b"\x00\x03")
+    on_error = mocker.Mock()
+    inbox = MessageInbox(socket, on_error=on_error)
+    recv_into = socket.recv_into
+    calls = 0
+
+    def interrupted_recv_into(buffer, nbytes):
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise asyncio.CancelledError
+        return recv_into(buffer, nbytes)
+
+    socket.recv_into = interrupted_recv_into
+    with pytest.raises(asyncio.CancelledError):
+        inbox.pop()
+    socket.inject(b"\xB1\x70\xA0\x00\x00")
+    with pytest.raises(StopIteration):
+        inbox.pop()
+    # the inbox gave up without reading the rest of the message
+    assert calls == 2
+    on_error.assert_not_called()
+
+
+@mark_sync_test
+def test_inbox_drops_read_ahead_after_failed_message(
+    fake_socket_2, mocker
+):
+    socket = fake_socket_2(("127.0.0.1", 7687))
+    # a message that isn't a structure, then a SUCCESS message, both
+    # arriving with the same read
+    socket.inject(b"\x00\x01\xC0\x00\x00"
+                  b"\x00\x03\xB1\x70\xA0\x00\x00")
+    recv_into = mocker.spy(socket, "recv_into")
+    inbox = MessageInbox(socket, on_error=print)
+    with pytest.raises(ValueError):
+        inbox.pop()
+    with pytest.raises(StopIteration):
+        inbox.pop()
+    assert recv_into.call_count == 1
+    # the SUCCESS read ahead is gone
+    assert inbox._rx_start == inbox._rx_end == 0
@@ -18,7 +18,9 @@
 
 import pytest
 
+from neo4j._exceptions import BoltProtocolError
 from neo4j._sync.io._bolt4 import Bolt4x0
+from neo4j._sync.io._common import Response
 from neo4j.conf import PoolConfig
 
 from ...._async_compat import mark_sync_test
@@ -82,6 +84,29 @@ def test_db_extra_in_run(fake_socket):
     assert fields[2] == {"db": "something"}
 
 
+@pytest.mark.parametrize(("mode", "expected_extra"), (
+    (None, {}),
+    ("w", {}),
+    ("WRITE", {}),
+    ("r", {"mode": "r"}),
+    ("READ", {"mode": "r"}),
+))
+@mark_sync_test
+def test_mode_extra_in_begin_and_run(fake_socket, mode, expected_extra):
+    address = ("127.0.0.1", 7687)
+    socket = fake_socket(address)
+    connection = Bolt4x0(address, socket, PoolConfig.max_connection_lifetime)
+    connection.begin(mode=mode)
+    connection.run("", {}, mode=mode)
+    connection.send_all()
+    tag, fields = socket.pop_message()
+    assert tag == b"\x11"
+    assert fields == [expected_extra]
+    tag, fields = socket.pop_message()
+    assert tag == b"\x10"
+    assert fields == ["", {}, expected_extra]
+
+
 @mark_sync_test
 def test_n_extra_in_discard(fake_socket):
     address = ("127.0.0.1", 7687)
@@ -205,3 +230,80 @@ def test_hint_recv_timeout_seconds_gets_ignored(
     )
     connection.hello()
     sockets.client.settimeout.assert_not_called()
+
+
+@mark_sync_test
+def test_local_port_is_resolved_once(fake_socket, mocker):
+    address = ("127.0.0.1", 7687)
+    socket = fake_socket(address)
+    socket.getsockname = mocker.MagicMock(return_value=("127.0.0.1", 4321))
+    connection = Bolt4x0(address, socket, PoolConfig.max_connection_lifetime)
+    connection.begin()
+    connection.run("RETURN 1")
+    connection.pull()
+    connection.send_all()
+    assert connection.local_port == 4321
+    socket.getsockname.assert_called_once_with()
+
+
+def test_local_port_defaults_to_0(fake_socket, mocker):
+    address = ("127.0.0.1", 7687)
+    socket = fake_socket(address)
+    socket.getsockname = mocker.MagicMock(side_effect=OSError)
+    connection = Bolt4x0(address, socket, PoolConfig.max_connection_lifetime)
+    assert connection.local_port == 0
+
+
+@pytest.mark.parametrize(("signature", "handler"), (
+    (0x70, "on_success"),
+    (0x7E, "on_ignored"),
+))
+@mark_sync_test
+def test_summary_dispatch(fake_socket_pair, signature, handler, mocker):
+    address = ("127.0.0.1", 7687)
+    sockets = fake_socket_pair(address)
+    sockets.server.send_message(signature, {"foo": "bar"})
+    connection = Bolt4x0(
+        address, sockets.client, PoolConfig.max_connection_lifetime
+    )
+    callback = mocker.Mock()
+    connection.pull(**{handler: callback})
+    connection.send_all()
+    connection.fetch_all()
+    callback.assert_called_once_with({"foo": "bar"})
+
+
+@mark_sync_test
+def test_unexpected_summary_signature(fake_socket_pair):
+    address = ("127.0.0.1", 7687)
+    sockets = fake_socket_pair(address)
+    sockets.server.send_message(0x7A, {})
+    connection = Bolt4x0(
+        address, sockets.client, PoolConfig.max_connection_lifetime
+    )
+    connection.pull()
+    connection.send_all()
+    with pytest.raises(BoltProtocolError, match="7A"):
+        connection.fetch_all()
+
+
+@mark_sync_test
+def test_is_reset(fake_socket_pair):
+    address = ("127.0.0.1", 7687)
+    sockets = fake_socket_pair(address)
+    sockets.server.send_message(0x70, {"server": "Neo4j/4.0.0"})
+    sockets.server.send_message(0x70, {})
+    connection = Bolt4x0(
+        address, sockets.client, PoolConfig.max_connection_lifetime
+    )
+    assert not connection.is_reset
+    connection.hello()
+    assert connection.is_reset
+    connection.begin()
+    connection.send_all()
+    connection.fetch_all()
+    assert not connection.is_reset
+    connection.goodbye()
+    assert not connection.is_reset
+    connection.responses.append(Response(connection, "reset"))
+    assert connection.is_reset
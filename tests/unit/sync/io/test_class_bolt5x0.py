@@ -0,0 +1,308 @@
+# Copyright (c) "Neo4j"
+# Neo4j Sweden AB [https://neo4j.com]
+#
+# This file is part of Neo4j.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import logging
+
+import pytest
+
+from neo4j._exceptions import BoltProtocolError
+from neo4j._sync.io._bolt5 import Bolt5x0
+from neo4j._sync.io._common import Response
+from neo4j.conf import PoolConfig
+
+from ...._async_compat import mark_sync_test
+
+
+@pytest.mark.parametrize("set_stale", (True, False))
+def test_conn_is_stale(fake_socket, set_stale):
+    address = ("127.0.0.1", 7687)
+    max_connection_lifetime = 0
+    connection = Bolt5x0(address, fake_socket(address), max_connection_lifetime)
+    if set_stale:
+        connection.set_stale()
+    assert connection.stale() is True
+
+
+@pytest.mark.parametrize("set_stale", (True, False))
+def test_conn_is_not_stale_if_not_enabled(fake_socket, set_stale):
+    address = ("127.0.0.1", 7687)
+    max_connection_lifetime = -1
+    connection = Bolt5x0(address, fake_socket(address), max_connection_lifetime)
+    if set_stale:
+        connection.set_stale()
+    assert connection.stale() is set_stale
+
+
+@pytest.mark.parametrize("set_stale", (True, False))
+def test_conn_is_not_stale(fake_socket, set_stale):
+    address = ("127.0.0.1", 7687)
+    max_connection_lifetime = 999999999
+    connection = Bolt5x0(address, fake_socket(address), max_connection_lifetime)
+    if set_stale:
+        connection.set_stale()
+    assert connection.stale() is set_stale
+
+
+@pytest.mark.parametrize(("args", "kwargs", "expected_fields"), (
+    (("", {}), {"db": "something"}, ({"db": "something"},)),
+    (("", {}), {"imp_user": "imposter"}, ({"imp_user": "imposter"},)),
+    (
+        ("", {}),
+        {"db": "something", "imp_user": "imposter"},
+        ({"db": "something", "imp_user": "imposter"},)
+    ),
+    ((), {"bookmarks": ["a", "b"]}, ({"bookmarks": ["a", "b"]},)),
+    ((), {"bookmarks": ("a", "b")}, ({"bookmarks": ["a", "b"]},)),
+    ((), {"metadata": {"foo": "bar"}}, ({"tx_metadata": {"foo": "bar"}},)),
+    ((), {"metadata": [("foo", "bar")]}, ({"tx_metadata": {"foo": "bar"}},)),
+    ((), {"timeout": 0}, ({"tx_timeout": 0},)),
+    ((), {"timeout": 2}, ({"tx_timeout": 2000},)),
+    ((), {"timeout": 1.25}, ({"tx_timeout": 1250},)),
+    ((), {"timeout": "1.5"}, ({"tx_timeout": 1500},)),
+))
+@mark_sync_test
+def test_extra_in_begin(fake_socket, args, kwargs, expected_fields):
+    address = ("127.0.0.1", 7687)
+    socket = fake_socket(address)
+    connection = Bolt5x0(address, socket, PoolConfig.max_connection_lifetime)
+    connection.begin(*args, **kwargs)
+    connection.send_all()
+    tag, is_fields = socket.pop_message()
+    assert tag == b"\x11"
+    assert tuple(is_fields) == expected_fields
+
+
+@pytest.mark.parametrize(("args", "kwargs", "expected_fields"), (
+    (("", {}), {"db": "something"}, ("", {}, {"db": "something"})),
+    (("", {}), {"imp_user": "imposter"}, ("", {}, {"imp_user": "imposter"})),
+    (
+        ("", {}),
+        {"db": "something", "imp_user": "imposter"},
+        ("", {}, {"db": "something", "imp_user": "imposter"})
+    ),
+))
+@mark_sync_test
+def test_extra_in_run(fake_socket, args, kwargs, expected_fields):
+    address = ("127.0.0.1", 7687)
+    socket = fake_socket(address)
+    connection = Bolt5x0(address, socket, PoolConfig.max_connection_lifetime)
+    connection.run(*args, **kwargs)
+    connection.send_all()
+    tag, is_fields = socket.pop_message()
+    assert tag == b"\x10"
+    assert tuple(is_fields) == expected_fields
+
+
+@pytest.mark.parametrize(("kwargs", "error"), (
+    ({"bookmarks": 1}, TypeError),
+    ({"metadata": 1}, TypeError),
+    ({"timeout": None, "metadata": [1]}, TypeError),
+    ({"timeout": [1]}, TypeError),
+    ({"timeout": -1}, ValueError),
+))
+@pytest.mark.parametrize("message", ("begin", "run"))
+def test_invalid_extra(fake_socket, kwargs, error, message):
+    address = ("127.0.0.1", 7687)
+    socket = fake_socket(address)
+    connection = Bolt5x0(address, socket, PoolConfig.max_connection_lifetime)
+    args = ("RETURN 1",) if message == "run" else ()
+    with pytest.raises(error):
+        getattr(connection, message)(*args, **kwargs)
+
+
+@mark_sync_test
+def test_messages_without_fields(fake_socket):
+    address = ("127.0.0.1", 7687)
+    socket = fake_socket(address)
+    connection = Bolt5x0(address, socket, PoolConfig.max_connection_lifetime)
+    connection.begin()
+    connection.commit()
+    connection.begin()
+    connection.rollback()
+    connection.goodbye()
+    connection.send_all()
+    for expected_tag in (b"\x11", b"\x12", b"\x11", b"\x13", b"\x02"):
+        tag, fields = socket.pop_message()
+        assert tag == expected_tag
+        assert fields == ([{}] if expected_tag == b"\x11" else [])
+
+
+@pytest.mark.parametrize(("signature", "handler"), (
+    (0x70, "on_success"),
+    (0x7E, "on_ignored"),
+))
+@mark_sync_test
+def test_summary_dispatch(fake_socket_pair, signature, handler, mocker):
+    address = ("127.0.0.1", 7687)
+    sockets = fake_socket_pair(address)
+    sockets.server.send_message(signature, {"foo": "bar"})
+    connection = Bolt5x0(
+        address, sockets.client, PoolConfig.max_connection_lifetime
+    )
+    callback = mocker.Mock()
+    connection.pull(**{handler: callback})
+    connection.send_all()
+    connection.fetch_all()
+    callback.assert_called_once_with({"foo": "bar"})
+
+
+@mark_sync_test
+def test_unexpected_summary_signature(fake_socket_pair):
+    address = ("127.0.0.1", 7687)
+    sockets = fake_socket_pair(address)
+    sockets.server.send_message(0x7A, {})
+    connection = Bolt5x0(
+        address, sockets.client, PoolConfig.max_connection_lifetime
+    )
+    connection.pull()
+    connection.send_all()
+    with pytest.raises(BoltProtocolError, match="7A"):
+        connection.fetch_all()
+
+
+def test_run_logs_fields(fake_socket, caplog):
+    address = ("127.0.0.1", 7687)
+    socket = fake_socket(address)
+    connection = Bolt5x0(address, socket, PoolConfig.max_connection_lifetime)
+    with caplog.at_level(logging.DEBUG):
+        connection.run("RETURN $x", {"x": 1}, db="foo")
+    assert any(
+        "C: RUN 'RETURN $x' {'x': 1} {'db': 'foo'}" in msg
+        for msg in caplog.messages
+    )
+
+
+@mark_sync_test
+def test_hello_does_not_alter_base_headers(fake_socket_pair):
+    address = ("127.0.0.1", 7687)
+    sockets = fake_socket_pair(address)
+    sockets.server.send_message(0x70, {"server": "Neo4j/5.0.0"})
+    connection = Bolt5x0(
+        address, sockets.client, PoolConfig.max_connection_lifetime,
+        auth=("user", "password"), routing_context={"foo": "bar"}
+    )
+    base_headers = connection.get_base_headers()
+    connection.hello()
+    assert connection.get_base_headers() is base_headers
+    assert base_headers == {
+        "user_agent": connection.user_agent, "routing": {"foo": "bar"}
+    }
+    tag, fields = sockets.server.pop_message()
+    assert tag == 0x01
+    assert fields[0]["credentials"] == "password"
+    assert fields[0]["routing"] == {"foo": "bar"}
+
+
+@mark_sync_test
+def test_is_reset(fake_socket_pair):
+    address = ("127.0.0.1", 7687)
+    sockets = fake_socket_pair(address)
+    sockets.server.send_message(0x70, {"server": "Neo4j/5.0.0"})
+    sockets.server.send_message(0x70, {})
+    connection = Bolt5x0(
+        address, sockets.client, PoolConfig.max_connection_lifetime
+    )
+    assert not connection.is_reset
+    connection.hello()
+    assert connection.is_reset
+    connection.begin()
+    connection.send_all()
+    connection.fetch_all()
+    assert not connection.is_reset
+    connection.goodbye()
+    assert not connection.is_reset
+    connection.responses.append(Response(connection, "reset"))
+    assert connection.is_reset
+
+
+@mark_sync_test
+def test_hello_does_not_log_credentials(fake_socket_pair, caplog):
+    address = ("127.0.0.1", 7687)
+    sockets = fake_socket_pair(address)
+    sockets.server.send_message(0x70, {"server": "Neo4j/5.0.0"})
+    connection = Bolt5x0(
+        address, sockets.client, PoolConfig.max_connection_lifetime,
+        auth=("user", "super secret")
+    )
+    with caplog.at_level(logging.DEBUG):
+        connection.hello()
+    tag, fields = sockets.server.pop_message()
+    assert tag == 0x01
+    assert fields[0]["credentials"] == "super secret"
+    assert any("C: HELLO" in msg and "'*******'" in msg
+               for msg in caplog.messages)
+    assert not any("super secret" in msg for msg in caplog.messages)
+
+
+@mark_sync_test
+def test_reset_failure(fake_socket_pair):
+    address = ("127.0.0.1", 7687)
+    sockets = fake_socket_pair(address)
+    sockets.server.send_message(0x7F, {"code": "Neo.Foo.Bar.Baz"})
+    # answer to the RESET sent while handling the failure
+    sockets.server.send_message(0x70, {})
+    connection = Bolt5x0(
+        address, sockets.client, PoolConfig.max_connection_lifetime
+    )
+    with pytest.raises(BoltProtocolError, match="RESET failed"):
+        connection.reset()
+    for _ in range(2):
+        tag, fields = sockets.server.pop_message()
+        assert tag == 0x0F
+        assert fields == []
+
+
+@mark_sync_test
+def test_local_port_is_resolved_once(fake_socket, mocker):
+    address = ("127.0.0.1", 7687)
+    socket = fake_socket(address)
+    socket.getsockname = mocker.MagicMock(return_value=("127.0.0.1", 4321))
+    connection = Bolt5x0(address, socket, PoolConfig.max_connection_lifetime)
+    connection.begin()
+    connection.run("RETURN 1")
+    connection.pull()
+    connection.send_all()
+    assert connection.local_port == 4321
+    socket.getsockname.assert_called_once_with()
+
+
+def test_local_port_defaults_to_0(fake_socket, mocker):
+    address = ("127.0.0.1", 7687)
+    socket = fake_socket(address)
+    socket.getsockname = mocker.MagicMock(side_effect=OSError)
+    connection = Bolt5x0(address, socket, PoolConfig.max_connection_lifetime)
+    assert connection.local_port == 0
+
+
+@pytest.mark.parametrize(("bookmarks", "expected"), (
+    (None, []),
+    (["a", "b"], ["a", "b"]),
+    (("a", "b"), ["a", "b"]),
+))
+@mark_sync_test
+def test_route_bookmarks(fake_socket_pair, bookmarks, expected):
+    address = ("127.0.0.1", 7687)
+    sockets = fake_socket_pair(address)
+    sockets.server.send_message(0x70, {"rt": {"ttl": 100}})
+    connection = Bolt5x0(
+        address, sockets.client, PoolConfig.max_connection_lifetime
+    )
+    assert connection.route(bookmarks=bookmarks) == [{"ttl": 100}]
+    tag, fields = sockets.server.pop_message()
+    assert tag == 0x66
+    assert fields[1] == expected
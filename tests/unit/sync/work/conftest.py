@@ -1,3 +1,4 @@
+from ..io.conftest import fake_socket_pair
 from ._fake_connection import (
     fake_connection,
     fake_connection_generator,
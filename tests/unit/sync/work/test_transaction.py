@@ -22,9 +22,12 @@ from uuid import uuid4
 import pytest
 
 from neo4j import (
+    ManagedTransaction,
     Query,
     Transaction,
 )
+from neo4j._sync.io._bolt5 import Bolt5x0
+from neo4j.conf import PoolConfig
 
 from ...._async_compat import mark_sync_test
 
@@ -209,3 +212,74 @@ def test_transaction_no_rollback_on_defunct_connections(
         fake_connection.is_reset_mock.assert_not_called()
         fake_connection.reset.assert_not_called()
         fake_connection.rollback.assert_not_called()
+
+
+@pytest.mark.parametrize(("tx_cls", "pipelined"), (
+    (Transaction, False),
+    (ManagedTransaction, True),
+))
+@mark_sync_test
+def test_transaction_begin_pipelining(
+    fake_connection, tx_cls, pipelined
+):
+    tx = tx_cls(
+        fake_connection, 2, lambda *args, **kwargs: None,
+        lambda *args, **kwargs: None
+    )
+    tx._begin(None, None, None, "r", None, None)
+    fake_connection.begin.assert_called_once()
+    if pipelined:
+        fake_connection.send_all.assert_not_called()
+    else:
+        fake_connection.send_all.assert_called_once()
+    tx.run("RETURN 1")
+    # BEGIN, RUN, and PULL go out in a single flush when pipelined
+    assert fake_connection.send_all.call_count == 1 + (not pipelined)
+
+
+@mark_sync_test
+def test_managed_transaction_rolls_back_queued_begin(
+    fake_connection
+):
+    tx = ManagedTransaction(
+        fake_connection, 2, lambda *args, **kwargs: None,
+        lambda *args, **kwargs: None
+    )
+    tx._begin(None, None, None, "r", None, None)
+    # BEGIN is still queued, so the server looks reset
+    fake_connection.is_reset_mock.return_value = True
+    tx._close()
+    fake_connection.rollback.assert_called_once()
+    fake_connection.send_all.assert_called_once()
+
+
+
+@mark_sync_test
+def test_managed_transaction_sends_queued_begin_on_rollback(
+    fake_socket_pair
+):
+    address = ("127.0.0.1", 7687)
+    sockets = fake_socket_pair(address)
+    # answers to HELLO, BEGIN and ROLLBACK
+    sockets.server.send_message(0x70, {"server": "Neo4j/5.0.0"})
+    sockets.server.send_message(0x70, {})
+    sockets.server.send_message(0x70, {})
+    connection = Bolt5x0(
+        address, sockets.client, PoolConfig.max_connection_lifetime
+    )
+    connection.hello()
+    tag, _ = sockets.server.pop_message()
+    assert tag == 0x01
+    tx = ManagedTransaction(
+        connection, 2, lambda *args, **kwargs: None,
+        lambda *args, **kwargs: None
+    )
+    tx._begin(None, None, None, "r", None, None)
+    # the transaction function raised before running a query
+    tx._close()
+    tag, _ = sockets.server.pop_message()
+    assert tag == 0x11
+    tag, _ = sockets.server.pop_message()
+    assert tag == 0x13
+    assert not connection.responses
+    assert connection.is_reset